@@ -0,0 +1,6 @@
+"""Basketball player & team ELO tracker.
+
+Importing the package (or any of its light modules) does no work: Selenium,
+pandas and NumPy are only imported by the modules that use them, and the CLI
+(`python -m elo_tracker <command>`) imports those lazily per subcommand.
+"""
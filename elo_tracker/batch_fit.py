@@ -0,0 +1,137 @@
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import lsqr
+
+from .compile_season import BASE_ELO, ELO_SCALE, SEASON_DIR, open_season
+
+# ---------------------------
+# Config
+# ---------------------------
+RIDGE = 1.0               # pull toward the grade offset, weighted like this many player lines
+GRADE_STEP = 25           # offset between consecutive grades, as in live.py
+ATOL = 1e-8
+BTOL = 1e-8
+ITER_LIMIT = 10_000
+
+GRADES_CSV = "data/grades.csv"
+BATCH_FIT_CSV = "data/batch_fit_elo.csv"
+
+
+# ---------------------------
+# Priors
+# ---------------------------
+def load_grade_offsets(path=GRADES_CSV, grades=()):
+    """grade -> starting ELO saved by the live scraper; falls back to the season's grade order."""
+    try:
+        with open(path, newline="") as f:
+            return {row["grade"]: float(row["offset"]) for row in csv.DictReader(f)}
+    except FileNotFoundError:
+        return {g: BASE_ELO - GRADE_STEP * i for i, g in enumerate(grades)}
+
+
+def line_games(season):
+    """Game index of every player line (expands the CSR row pointers)."""
+    return np.repeat(np.arange(season.n_games), np.diff(season.game_offsets))
+
+
+def prior_ratings(season, offsets):
+    """Each player's prior is the offset of the grade they were first seen in."""
+    n_lines = len(season.player_idx)
+    first = np.full(len(season.players), n_lines)
+    np.minimum.at(first, season.player_idx, np.arange(n_lines))
+    grade_offset = np.array([offsets.get(g, BASE_ELO) for g in season.meta["grades"]], dtype=float)
+    return grade_offset[season.game_grade[line_games(season)[first]]]
+
+
+# ---------------------------
+# Sparse least-squares fit
+# ---------------------------
+def design_matrix(season, ridge=RIDGE):
+    """One row per player line: u_player + b_game = log S, then one ridge row per player.
+
+    u = R * ln10 / scale is the rating in log-share units and b_game absorbs the
+    softmax denominator, so each line row has two non-zeros.
+    """
+    n_players, n_games = len(season.players), season.n_games
+    n_lines = len(season.player_idx)
+    lines = np.arange(n_lines)
+    rows = np.concatenate([lines, lines, n_lines + np.arange(n_players)])
+    cols = np.concatenate([season.player_idx, n_players + line_games(season), np.arange(n_players)])
+    data = np.concatenate([np.ones(2 * n_lines), np.full(n_players, np.sqrt(ridge))])
+    return csr_matrix((data, (rows, cols)), shape=(n_lines + n_players, n_players + n_games))
+
+
+def warm_start(season, ratings, scale=ELO_SCALE):
+    """Solver start vector from per-player ratings; each game's b is its mean residual."""
+    c = np.log(10.0) / scale
+    u = c * ratings
+    games = line_games(season)
+    resid = np.log(season.S) - u[season.player_idx]
+    counts = np.bincount(games, minlength=season.n_games)
+    b = np.bincount(games, weights=resid, minlength=season.n_games) / np.maximum(counts, 1)
+    return np.concatenate([u, b])
+
+
+def previous_ratings(season, prior, path=BATCH_FIT_CSV):
+    """Last fit's ratings matched by player name (new players start from their prior), or None."""
+    if not os.path.exists(path):
+        return None
+    ratings = prior.copy()
+    df_prev = pd.read_csv(path)
+    prev = dict(zip(df_prev["player_name"], df_prev["ELO"]))
+    for i, name in enumerate(season.players):
+        if name in prev:
+            ratings[i] = prev[name]
+    return ratings
+
+
+def fit_season(season, ridge=RIDGE, scale=ELO_SCALE, offsets=None, start=None,
+               atol=ATOL, btol=BTOL, iter_lim=ITER_LIMIT):
+    """Order-independent ratings for the whole season from one lsqr solve.
+
+    start (per-player ratings, e.g. the previous fit) seeds the solver; the
+    answer does not depend on it, only the iteration count does.
+    """
+    if offsets is None:
+        offsets = load_grade_offsets(grades=season.meta["grades"])
+    c = np.log(10.0) / scale
+    prior = prior_ratings(season, offsets)
+
+    A = design_matrix(season, ridge)
+    rhs = np.concatenate([np.log(season.S), np.sqrt(ridge) * c * prior])
+    x0 = warm_start(season, prior if start is None else start, scale)
+
+    x, _, itn = lsqr(A, rhs, atol=atol, btol=btol, iter_lim=iter_lim, x0=x0)[:3]
+    return x[:len(season.players)] / c, prior, itn
+
+
+def fit_table(season, ratings, prior):
+    """Player table in the shape of player_elo.csv plus the prior and line count."""
+    n_lines = len(season.player_idx)
+    last = np.full(len(season.players), -1)
+    np.maximum.at(last, season.player_idx, np.arange(n_lines))
+    team_idx = season.line_team[last]
+    return pd.DataFrame({
+        "player_name": season.players,
+        "team_id": [season.teams[t] for t in team_idx],
+        "team_name": [season.meta["team_names"][t] for t in team_idx],
+        "ELO": ratings,
+        "prior": prior,
+        "lines": np.bincount(season.player_idx, minlength=len(season.players)),
+    })
+
+
+def run(season_dir=SEASON_DIR, out_csv=BATCH_FIT_CSV, ridge=RIDGE, warm=True):
+    """Fit the compiled season, warm-started from out_csv if it exists, and save the table."""
+    season = open_season(season_dir)
+    offsets = load_grade_offsets(grades=season.meta["grades"])
+    start = previous_ratings(season, prior_ratings(season, offsets), out_csv) if warm else None
+
+    ratings, prior, itn = fit_season(season, ridge=ridge, offsets=offsets, start=start)
+    df = fit_table(season, ratings, prior)
+    df.to_csv(out_csv, index=False)
+    return df, itn
@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .compile_season import compile_season, load_frames, open_season
+from .leaderboard import LeaderboardSet
+from .rating_models import ShareElo, run_blocks
+from .team_rating import RollingTeamRating
+from .rating import (BASE_ELO, K_PLAYER, ELO_SCALE, TEAM_TOP_N, ROLLING_WINDOW, TOP_K_PLAYERS,
+                     GAMES_CSV, PLAYERS_CSV, OUT_DIR)
+
+
+# ---------------------------
+# Rating run with simultaneous per-date / per-round updates
+# ---------------------------
+def run(games_csv=GAMES_CSV, players_csv=PLAYERS_CSV, out_dir=OUT_DIR, by="date", season_dir=None):
+    """Same model and outputs as rating.run, but every game in a date (or grade round)
+    is rated from the ratings before that block, so row order within it no longer matters.
+
+    The season is compiled to season_dir (default out_dir/season) and each block
+    is one vectorized update over all of its games' lines.
+    """
+    season_dir = season_dir or os.path.join(out_dir, "season")
+    compile_season(games_csv, players_csv, season_dir)
+    season = open_season(season_dir)
+
+    offsets = np.asarray(season.game_offsets)
+    player_idx = np.asarray(season.player_idx)
+    line_team = np.asarray(season.line_team)
+    raw_perf = np.asarray(season.raw_perf)
+    rolling_teams = RollingTeamRating(window=ROLLING_WINDOW)
+
+    def push_lineups(games, state):
+        # rolling team ratings see each lineup at its post-block ratings
+        ratings = state["rating"]
+        for g in games:
+            sl = slice(offsets[g], offsets[g + 1])
+            for team in (season.game_home[g], season.game_away[g]):
+                mask = line_team[sl] == team
+                rolling_teams.push(season.teams[team], ratings[player_idx[sl][mask]], raw_perf[sl][mask])
+
+    model = ShareElo(k=K_PLAYER, scale=ELO_SCALE, init=BASE_ELO)
+    ratings = model.ratings(run_blocks(season, model, by, on_block=push_lineups))
+
+    # ---------------------------
+    # Team ELOs: mean of the top players who ever played for the team
+    # ---------------------------
+    boards = LeaderboardSet()
+    for p, t in set(zip(player_idx.tolist(), line_team.tolist())):
+        boards.update(season.players[p], float(ratings[p]), team=season.teams[t])
+
+    df_games, _ = load_frames(games_csv, players_csv)
+    team_id_to_name = dict(zip(df_games['home_team_id'], df_games['home_team']))
+    team_id_to_name.update(zip(df_games['away_team_id'], df_games['away_team']))
+    all_team_ids = pd.concat([df_games['home_team_id'], df_games['away_team_id']]).unique()
+    team_elo = {tid: float(boards.team_rating(tid, k=TEAM_TOP_N, default=BASE_ELO)) for tid in all_team_ids}
+
+    # ---------------------------
+    # Output & Save
+    # ---------------------------
+    last_line = np.full(len(season.players), -1)
+    np.maximum.at(last_line, player_idx, np.arange(len(player_idx)))
+    last_team = [season.teams[t] for t in line_team[last_line]]
+    df_player_elos = pd.DataFrame({
+        "player_name": season.players,
+        "team_id": last_team,
+        "team_name": [team_id_to_name.get(t, "Unknown") for t in last_team],
+        "ELO": ratings,
+    })
+    df_player_elos.to_csv(os.path.join(out_dir, "player_elo.csv"), index=False)
+    pd.DataFrame([
+        {"team_id": tid, "team_name": team_id_to_name.get(tid, tid), "ELO": elo,
+         "rolling_ELO": rolling_teams.rating(tid, default=BASE_ELO)}
+        for tid, elo in team_elo.items()
+    ]).to_csv(os.path.join(out_dir, "team_elo.csv"), index=False)
+
+    print(f"Top {TOP_K_PLAYERS} player ELOs (updates batched by {by}):")
+    print(df_player_elos.sort_values("ELO", ascending=False).head(TOP_K_PLAYERS).to_string(index=False))
+    return dict(zip(season.players, ratings)), team_elo
@@ -0,0 +1,118 @@
+import os
+import tempfile
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+# -----------------------
+# Configuration
+# -----------------------
+LEAN_PROFILE = True       # eager loads, no images/fonts/media/trackers, shared disk cache
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "bball-elo-chrome-cache")
+CACHE_SIZE = 256 * 1024 * 1024
+
+# Blocked at the DevTools network layer, so the requests are never sent
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*segment.io*", "*segment.com*", "*intercom.io*", "*sentry.io*",
+    "*newrelic.com*", "*nr-data.net*", "*clarity.ms*",
+]
+
+# Sum of bytes actually received over the network for the current document
+TRANSFER_SIZE_JS = """
+return performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'))
+    .reduce((total, e) => total + (e.transferSize || 0), 0);
+"""
+
+
+# -----------------------
+# Selenium driver factory
+# -----------------------
+def create_driver(headless=True, lean=LEAN_PROFILE):
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")  # options.headless is deprecated and ignored by new Chrome
+    options.add_argument("--window-size=1920,1080")
+
+    if lean:
+        options.page_load_strategy = "eager"  # return at DOMContentLoaded; callers wait for their selectors
+        for arg in (
+            "--disable-extensions",
+            "--disable-gpu",
+            "--disable-dev-shm-usage",
+            "--disable-background-networking",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+            "--blink-settings=imagesEnabled=false",
+            f"--disk-cache-dir={CACHE_DIR}",
+            f"--disk-cache-size={CACHE_SIZE}",
+        ):
+            options.add_argument(arg)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+
+    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+    if lean:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        driver.execute_cdp_cmd("Performance.enable", {})
+    return driver
+
+
+# -----------------------
+# Measurement
+# -----------------------
+def page_transfer_bytes(driver):
+    """Bytes received for the page currently loaded (cache hits and blocked requests count 0)."""
+    try:
+        return int(driver.execute_script(TRANSFER_SIZE_JS) or 0)
+    except Exception:
+        return 0
+
+
+def _child_pids(pid):
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(c) for c in f.read().split())
+    except OSError:
+        return []
+    for child in list(children):
+        children.extend(_child_pids(child))
+    return children
+
+
+def driver_memory(driver):
+    """(JS heap bytes, browser process-tree RSS bytes or None where /proc is unavailable)."""
+    js_heap = 0
+    try:
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        js_heap = int(next((m["value"] for m in metrics if m["name"] == "JSHeapTotalSize"), 0))
+    except Exception:
+        pass
+
+    try:
+        root = driver.service.process.pid
+    except AttributeError:
+        return js_heap, None
+    rss = 0
+    for pid in [root] + _child_pids(root):
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                rss += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            continue
+    return js_heap, rss or None
@@ -0,0 +1,216 @@
+import os
+import threading
+from array import array
+
+import numpy as np
+import pandas as pd
+
+# -----------------------
+# Configuration
+# -----------------------
+FLUSH_ROWS = 50_000       # rows held in memory before a chunk is appended to disk
+
+# Column kinds: "s" = interned string, "l" = int64, "d" = float64 (None -> NaN), "b" = bool
+GAME_COLUMNS = {
+    "grade": "s", "round": "s", "date": "s",
+    "home_team": "s", "home_team_id": "s", "away_team": "s", "away_team_id": "s",
+    "home_score": "d", "away_score": "d", "forfeit": "b", "box_score_link": "s",
+}
+PLAYER_COLUMNS = {
+    "box_score_link": "s", "grade": "s", "game_date": "s", "round": "s",
+    "team": "s", "player_id": "s", "player_name": "s", "jersey": "s",
+    "points": "l", "1PM": "l", "2PM": "l", "3PM": "l", "fouls": "l",
+}
+
+
+# -----------------------
+# String interning
+# -----------------------
+class StringPool:
+    """Each distinct string is stored once; columns hold its int code (-1 = missing)."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+        self.lock = threading.Lock()
+
+    def code(self, value):
+        if value is None or value != value:   # None / NaN
+            return -1
+        value = str(value)
+        code = self.codes.get(value)
+        if code is None:
+            with self.lock:
+                code = self.codes.setdefault(value, len(self.values))
+                if code == len(self.values):
+                    self.values.append(value)
+        return code
+
+    def __getitem__(self, code):
+        return None if code < 0 else self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+# -----------------------
+# Columnar row buffer
+# -----------------------
+def _number(value, kind):
+    if value is None or value != value:
+        return float("nan") if kind == "d" else 0
+    return float(value) if kind == "d" else int(value)
+
+
+class RowBuffer:
+    """Append-only table kept as one typed array per column instead of a list of dicts.
+
+    key names a column (e.g. box_score_link) whose rows can be fetched in O(1).
+    With a path, maybe_flush() appends the chunk to path + ".partial" once it
+    holds flush_rows rows and drops it from memory (callers flush between games
+    so a game's rows are never split from their lookup); close() moves the
+    finished file into place.
+    """
+
+    def __init__(self, columns, key=None, path=None, flush_rows=FLUSH_ROWS, pool=None):
+        self.columns = dict(columns)
+        self.key = key
+        self.path = path
+        self.flush_rows = flush_rows
+        self.pool = pool if pool is not None else StringPool()
+        self.lock = threading.RLock()
+        self.data = {name: array("b" if kind == "b" else "l" if kind in "sl" else "d")
+                     for name, kind in self.columns.items()}
+        self.index = {}       # key value -> row numbers in the in-memory chunk
+        self.flushed = 0      # rows already written to disk
+        self.chunks = 0
+
+    # -----------------------
+    # Appending
+    # -----------------------
+    def append(self, row):
+        """Add one row (a dict; missing columns are empty) and return its row number in memory."""
+        with self.lock:
+            pos = self._buffered()
+            for name, kind in self.columns.items():
+                value = row.get(name)
+                if kind == "s":
+                    self.data[name].append(self.pool.code(value))
+                elif kind == "b":
+                    self.data[name].append(1 if value is True or (value == value and bool(value)) else 0)
+                else:
+                    self.data[name].append(_number(value, kind))
+            if self.key is not None:
+                self.index.setdefault(row.get(self.key), []).append(pos)
+            return pos
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def extend_frame(self, df):
+        """Append a DataFrame column by column, without building a dict per row."""
+        with self.lock:
+            start = self._buffered()
+            for name, kind in self.columns.items():
+                values = df[name] if name in df.columns else [None] * len(df)
+                if kind == "s":
+                    self.data[name].extend(self.pool.code(v) for v in values)
+                elif kind == "b":
+                    self.data[name].extend(1 if v is True or (v == v and bool(v)) else 0 for v in values)
+                else:
+                    self.data[name].extend(_number(v, kind) for v in values)
+            if self.key is not None and self.key in df.columns:
+                for pos, value in enumerate(df[self.key], start):
+                    self.index.setdefault(value, []).append(pos)
+
+    def update(self, pos, name, value):
+        with self.lock:
+            self.data[name][pos] = _number(value, self.columns[name])
+
+    # -----------------------
+    # Lookups (in-memory chunk only)
+    # -----------------------
+    def row(self, pos):
+        out = {}
+        for name, kind in self.columns.items():
+            value = self.data[name][pos]
+            if kind == "s":
+                value = self.pool[value]
+            elif kind == "b":
+                value = bool(value)
+            elif kind == "d" and value != value:
+                value = None
+            out[name] = value
+        return out
+
+    def positions(self, key_value):
+        return list(self.index.get(key_value, ()))
+
+    def rows(self, key_value):
+        """Rows whose key column equals key_value, as dicts."""
+        with self.lock:
+            return [self.row(pos) for pos in self.index.get(key_value, ())]
+
+    def __contains__(self, key_value):
+        return key_value in self.index
+
+    def __iter__(self):
+        for pos in range(self._buffered()):
+            yield self.row(pos)
+
+    def _buffered(self):
+        return len(self.data[next(iter(self.data))]) if self.data else 0
+
+    def __len__(self):
+        return self.flushed + self._buffered()
+
+    # -----------------------
+    # Output
+    # -----------------------
+    def to_frame(self):
+        """The in-memory chunk as a DataFrame; strings stay as categoricals over the pool."""
+        categories = pd.Index(self.pool.values[:])
+        frame = {}
+        for name, kind in self.columns.items():
+            column = self.data[name]
+            # copied so no numpy view pins the array's buffer while it keeps growing
+            values = np.frombuffer(column, dtype=column.typecode).copy() if len(column) else np.empty(0, column.typecode)
+            if kind == "s":
+                frame[name] = pd.Categorical.from_codes(values, categories=categories)
+            elif kind == "b":
+                frame[name] = values.astype(bool)
+            else:
+                frame[name] = values
+        return pd.DataFrame(frame)
+
+    def maybe_flush(self):
+        if self.path and self._buffered() >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """Append the in-memory chunk to path + ".partial" and free it."""
+        with self.lock:
+            n = self._buffered()
+            if not self.path or n == 0:
+                return
+            partial = self.path + ".partial"
+            os.makedirs(os.path.dirname(partial) or ".", exist_ok=True)
+            self.to_frame().to_csv(partial, mode="w" if self.chunks == 0 else "a", header=self.chunks == 0, index=False)
+            self.chunks += 1
+            self.flushed += n
+            for name in self.data:
+                del self.data[name][:]
+            self.index.clear()
+
+    def close(self):
+        """Write the last chunk and move the finished file to path; returns the total row count."""
+        with self.lock:
+            if not self.path:
+                return len(self)
+            if self.chunks == 0 and self._buffered() == 0:
+                self.to_frame().to_csv(self.path, index=False)   # nothing scraped: header-only file
+                return 0
+            self.flush()
+            os.replace(self.path + ".partial", self.path)
+            return self.flushed
@@ -0,0 +1,247 @@
+import bisect
+import json
+import os
+
+# -----------------------
+# Configuration
+# -----------------------
+FEED_DIR = "data/feed"
+SEGMENT_RECORDS = 100_000     # start a new segment file after this many records
+SEGMENT_SUFFIX = ".jsonl"
+
+
+# -----------------------
+# Append-only rating change feed
+# -----------------------
+class ChangeFeed:
+    """Rating changes as an append-only log of JSONL segments with consumer cursors.
+
+    Every record is {"offset", "game_id", "player", "old", "new", "delta"}
+    (player is the name ratings are keyed by); offsets are global and dense,
+    and each segment file is named after the offset of its first record, so a
+    reader can seek straight to any point.
+    A game is only ever emitted once (tracked in games.txt), so re-running the
+    rating stage over the whole season appends just the newly rated games,
+    plus "correction:<offset>" records for players whose rating moved because
+    an already emitted game was re-rated (e.g. a late box score).
+
+    A game's records are written first and its id is added to games.txt
+    after them, so games.txt marks the committed games. Readers (the default)
+    never write to the feed and only see committed games; a writer
+    (writer=True) first truncates anything a crashed run left uncommitted.
+
+    A writer needs every player's last emitted rating. On close it saves them
+    with the offset they are current to in emitted.json, so the next writer
+    only replays the records after that offset.
+    """
+
+    def __init__(self, path=FEED_DIR, segment_records=SEGMENT_RECORDS, writer=False):
+        self.path = path
+        self.segment_records = segment_records
+        self.writer = writer
+        if writer:
+            os.makedirs(path, exist_ok=True)
+        names = os.listdir(path) if os.path.isdir(path) else []
+        self.bases = sorted(int(f[:-len(SEGMENT_SUFFIX)]) for f in names if f.endswith(SEGMENT_SUFFIX))
+        self.games_path = os.path.join(path, "games.txt")
+        self.cursors_path = os.path.join(path, "cursors.json")
+        self.checkpoint_path = os.path.join(path, "emitted.json")
+        self.games = self._read_games()
+        self.next_offset = self._recover() if writer else self._committed_end()
+        self._segment = None
+        self._games_file = None
+        # player -> last rating the feed emitted, so re-rated history can be corrected
+        self._checkpoint_offset = 0
+        self.emitted = self._load_emitted() if writer else {}
+
+    def _segment_path(self, base):
+        return os.path.join(self.path, f"{base:020d}{SEGMENT_SUFFIX}")
+
+    def _read_games(self):
+        """Committed game ids; a torn last line (no newline) is not a commit."""
+        if not os.path.exists(self.games_path):
+            return set()
+        with open(self.games_path) as f:
+            return {line.rstrip("\n") for line in f if line.endswith("\n") and line.strip()}
+
+    def _tail_lines(self):
+        """Complete lines of the last segment, and how many of them belong to committed games."""
+        if not self.bases:
+            return [], 0
+        with open(self._segment_path(self.bases[-1]), "rb") as f:
+            data = f.read()
+        lines = data[:data.rfind(b"\n") + 1].splitlines(keepends=True)
+        committed = len(lines)
+        # games are appended whole, so uncommitted records can only sit at the end
+        while committed and json.loads(lines[committed - 1])["game_id"] not in self.games:
+            committed -= 1
+        return lines, committed
+
+    def _committed_end(self):
+        lines, committed = self._tail_lines()
+        return self.bases[-1] + committed if self.bases else 0
+
+    def _recover(self):
+        """Truncate a crashed run's torn line and uncommitted game; returns the next offset."""
+        if os.path.exists(self.games_path):
+            with open(self.games_path, "rb+") as f:
+                data = f.read()
+                f.truncate(data.rfind(b"\n") + 1)
+        if not self.bases:
+            return 0
+        lines, committed = self._tail_lines()
+        with open(self._segment_path(self.bases[-1]), "rb+") as f:
+            f.truncate(sum(len(line) for line in lines[:committed]))
+        return self.bases[-1] + committed
+
+    def _load_emitted(self):
+        """Last emitted ratings from the checkpoint, brought up to date by replaying the records after it."""
+        emitted, offset = {}, 0
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            # a checkpoint past the committed end can't be trusted; rebuild from the start
+            if checkpoint["offset"] <= self.next_offset:
+                emitted, offset = checkpoint["ratings"], checkpoint["offset"]
+        self._checkpoint_offset = offset
+        for r in self.replay(offset):
+            emitted[r["player"]] = r["new"]
+        return emitted
+
+    def _save_emitted(self):
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"offset": self.next_offset, "ratings": self.emitted}, f)
+        os.replace(tmp, self.checkpoint_path)
+        self._checkpoint_offset = self.next_offset
+
+    # -----------------------
+    # Writing
+    # -----------------------
+    def append_game(self, game_id, changes):
+        """Append one game's (player, old, new) changes; returns False if the game was already emitted.
+
+        If a player's old rating is not the last value the feed emitted for them
+        (an earlier game was re-rated), a correction record is appended first.
+        """
+        if not self.writer:
+            raise ValueError("feed was opened read-only; pass writer=True to append")
+        game_id = str(game_id)
+        if game_id in self.games:
+            return False
+        changes = [(player, float(old), float(new)) for player, old, new in changes]
+        self._corrections((player, old) for player, old, _ in changes)
+        self._write_group(game_id, changes)
+        return True
+
+    def reconcile(self, ratings, default):
+        """Emit corrections so every player's last emitted rating matches ratings (player -> rating).
+
+        Call after a rating run: games emitted by earlier runs are skipped, so
+        a recompute that moved their ratings is only visible through this.
+        Players the feed has never emitted are compared against default.
+        """
+        return self._corrections(ratings.items(), default)
+
+    def _corrections(self, current, default=None):
+        changes = []
+        for player, rating in current:
+            last = self.emitted.get(player, default)
+            if last is not None and round(float(rating), 4) != round(last, 4):
+                changes.append((player, last, float(rating)))
+        if changes:
+            self._write_group(f"correction:{self.next_offset}", changes)
+        return len(changes)
+
+    def _write_group(self, game_id, changes):
+        """Write one game's records, then commit it by adding its id to games.txt."""
+        if self._segment is None or self.next_offset - self.bases[-1] >= self.segment_records:
+            self._rotate()
+
+        lines = []
+        for player, old, new in changes:
+            lines.append(json.dumps({
+                "offset": self.next_offset + len(lines),
+                "game_id": game_id,
+                "player": player,
+                "old": round(old, 4),
+                "new": round(new, 4),
+                "delta": round(new - old, 4),
+            }) + "\n")
+            self.emitted[player] = round(new, 4)
+        self._segment.write("".join(lines))
+        self._segment.flush()
+        self.next_offset += len(lines)
+
+        self.games.add(game_id)
+        self._games_file.write(game_id + "\n")
+        self._games_file.flush()
+
+    def _rotate(self):
+        if self._segment is not None:
+            self._segment.close()
+        if not self.bases or self.next_offset - self.bases[-1] >= self.segment_records:
+            self.bases.append(self.next_offset)
+        self._segment = open(self._segment_path(self.bases[-1]), "a")
+        if self._games_file is None:
+            self._games_file = open(self.games_path, "a")
+
+    def close(self):
+        for f in (self._segment, self._games_file):
+            if f is not None:
+                f.close()
+        self._segment = self._games_file = None
+        if self.writer and self.next_offset != self._checkpoint_offset:
+            self._save_emitted()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------
+    # Reading
+    # -----------------------
+    def replay(self, offset=0, limit=None):
+        """Yield committed records from offset onwards (up to limit), opening only the segments needed."""
+        if self._segment is not None:
+            self._segment.flush()
+        start = max(bisect.bisect_right(self.bases, offset) - 1, 0)
+        emitted = 0
+        for base in self.bases[start:]:
+            with open(self._segment_path(base)) as f:
+                for i, line in enumerate(f):
+                    if base + i >= self.next_offset:
+                        return   # past what was committed when the feed was opened (or last appended)
+                    if base + i < offset:
+                        continue
+                    if limit is not None and emitted >= limit:
+                        return
+                    yield json.loads(line)
+                    emitted += 1
+
+    def cursors(self):
+        if not os.path.exists(self.cursors_path):
+            return {}
+        with open(self.cursors_path) as f:
+            return json.load(f)
+
+    def commit(self, consumer, offset):
+        """Save the next offset this consumer should read from (atomic write)."""
+        cursors = self.cursors()
+        cursors[consumer] = offset
+        tmp = self.cursors_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(cursors, f, indent=2)
+        os.replace(tmp, self.cursors_path)
+
+    def tail(self, consumer, limit=None, commit=True):
+        """Records this consumer hasn't seen yet; moves its cursor past them unless commit=False."""
+        records = list(self.replay(self.cursors().get(consumer, 0), limit))
+        if commit and records:
+            self.commit(consumer, records[-1]["offset"] + 1)
+        return records
+
+    def __len__(self):
+        return self.next_offset
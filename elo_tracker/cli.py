@@ -0,0 +1,337 @@
+import argparse
+import csv
+import os
+import sys
+import time
+
+# Only the standard library is imported here. Each subcommand imports the
+# modules it needs (and with them Selenium / pandas / NumPy) when it runs.
+
+GAMES_CSV = "data/full_season.csv"
+PLAYERS_CSV = "data/player_stats.csv"
+TEAM_ELO_CSV = "data/team_elo.csv"
+PLAYER_ELO_CSV = "data/player_elo.csv"
+SEASON_DIR = "data/season"
+
+
+# -----------------------
+# scrape
+# -----------------------
+def cmd_scrape(args):
+    if args.with_ratings:
+        from . import live
+        live.run(start_page=args.start_page or live.START_PAGE)
+    else:
+        from . import scraper
+        scraper.run(start_page=args.start_page or scraper.START_PAGE,
+                    retry_failed=args.retry_failed, full_refresh=args.full,
+                    future_fixtures=args.future_fixtures or None)
+
+
+# -----------------------
+# rate
+# -----------------------
+def cmd_rate(args):
+    start = time.perf_counter()
+    if args.model == "team-result":
+        from . import team_result
+        team_result.run(args.games, args.players)
+    elif args.batch_by != "game":
+        if args.stream or args.feed:
+            sys.exit("--batch-by date/round rates from the compiled season; it can't be combined with --stream or --feed")
+        from . import batched
+        batched.run(args.games, args.players, args.out_dir, by=args.batch_by)
+    elif args.stream:
+        if args.feed:
+            sys.exit("--stream doesn't emit rating changes; run --feed without --stream")
+        from .stream_ratings import stream_rate
+        df_players, df_teams = stream_rate(args.games, args.players, args.out_dir, args.chunksize, args.tmp_dir)
+        print(f"Streamed ELO for {len(df_players)} players / {len(df_teams)} teams. CSVs saved to {args.out_dir}/")
+    elif args.feed:
+        from . import rating
+        from .change_feed import ChangeFeed
+        with ChangeFeed(args.feed, writer=True) as feed:
+            before = len(feed)
+            rating.run(args.games, args.players, args.out_dir, verbose=args.verbose, feed=feed)
+            print(f"Appended {len(feed) - before} rating changes to {args.feed}")
+    else:
+        from . import rating
+        rating.run(args.games, args.players, args.out_dir, verbose=args.verbose)
+    print(f"Rating run took {time.perf_counter() - start:.2f}s")
+
+    if args.model == "share":
+        from .search import build_index
+        n_docs = build_index(os.path.join(args.out_dir, "search"),
+                             os.path.join(args.out_dir, "player_elo.csv"),
+                             os.path.join(args.out_dir, "team_elo.csv"), args.players, args.chunksize)
+        print(f"Search index rebuilt over {n_docs} player and team names")
+
+
+# -----------------------
+# teams (csv module only, so it starts instantly)
+# -----------------------
+def cmd_teams(args):
+    with open(args.team_elo, newline="") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        print(f"No teams in {args.team_elo}")
+        return
+    col = args.by if args.by in rows[0] else "ELO"
+    rows.sort(key=lambda r: float(r[col] or 0.0), reverse=True)
+    for rank, row in enumerate(rows[:args.top] if args.top else rows, 1):
+        print(f"{rank:>3}. {row['team_name']} ({row['team_id']}): {float(row[col]):.1f}")
+
+
+# -----------------------
+# feed (stdlib only, like teams)
+# -----------------------
+def cmd_feed(args):
+    import json
+    from .change_feed import ChangeFeed
+
+    feed = ChangeFeed(args.dir)
+    if args.action == "cursors":
+        print(json.dumps({"next_offset": len(feed), "cursors": feed.cursors()}, indent=2))
+        return
+    if args.action == "tail":
+        records = feed.tail(args.consumer, limit=args.limit, commit=not args.peek)
+    else:
+        records = feed.replay(args.offset, limit=args.limit)
+    for record in records:
+        print(json.dumps(record))
+
+
+# -----------------------
+# search (stdlib only, like teams)
+# -----------------------
+def cmd_search(args):
+    from .search import SearchIndex
+
+    start = time.perf_counter()
+    index = SearchIndex(args.index)
+    loaded = time.perf_counter()
+    results = index.search(" ".join(args.query), kind=args.kind, limit=args.limit, by=args.by,
+                           fuzzy=not args.no_fuzzy)
+    done = time.perf_counter()
+
+    for r in results:
+        last = f", last played {r['last_played']}" if r["last_played"] else ""
+        print(f"{r['rating']:7.1f}  {r['name']} [{r['kind']}, {r['team']}{last}] ({r['match']})")
+    if args.timing:
+        print(f"{len(results)} results in {(done - start) * 1000:.3f} ms "
+              f"(index open {(loaded - start) * 1000:.3f} ms, query {(done - loaded) * 1000:.3f} ms)")
+
+
+# -----------------------
+# predict
+# -----------------------
+def cmd_predict(args):
+    import pandas as pd
+    from . import predict
+
+    team_elo, player_elo = predict.load_ratings(args.team_elo, args.player_elo, team_col=args.team_rating)
+
+    if args.home or args.away:
+        if not (args.home and args.away):
+            sys.exit("--home and --away must be given together")
+        fixtures = pd.DataFrame([{
+            "home_team_id": args.home,
+            "away_team_id": args.away,
+            "home_lineup": _parse_lineup(args.home_lineup),
+            "away_lineup": _parse_lineup(args.away_lineup),
+        }])
+    else:
+        fixtures = predict.upcoming_fixtures(args.games)
+
+    start = time.perf_counter()
+    predictions = predict.predict_games(fixtures, team_elo, player_elo, home_advantage=args.home_advantage)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    predictions.to_csv(args.out, index=False)
+    print(f"Predicted {len(predictions)} fixtures in {elapsed_ms:.1f} ms. Saved to {args.out}")
+    for _, row in predictions.head(20).iterrows():
+        home = row.get("home_team", row["home_team_id"])
+        away = row.get("away_team", row["away_team_id"])
+        print(f"{home} vs {away}: {row['home_win_prob']:.1%} home win ({row['elo_diff']:+.1f})")
+
+
+def _parse_lineup(text):
+    return [n.strip() for n in text.split(",") if n.strip()] if text else None
+
+
+# -----------------------
+# simulate
+# -----------------------
+def cmd_simulate(args):
+    from .predict import load_ratings
+    from .simulate import simulate_season
+
+    team_elo, _ = load_ratings(args.team_elo, args.player_elo, team_col=args.team_rating)
+    start = time.perf_counter()
+    df = simulate_season(args.games, team_elo, n_sims=args.sims, seed=args.seed, workers=args.workers,
+                         batch_size=args.batch_size, home_advantage=args.home_advantage)
+    elapsed = time.perf_counter() - start
+
+    df.to_csv(args.out, index=False)
+    print(f"Simulated {args.sims} seasons for {df['grade'].nunique()} grades in {elapsed:.2f}s. Saved to {args.out}")
+    for grade, rows in df.groupby("grade", sort=False):
+        print(f"\n{grade}")
+        for _, row in rows.sort_values("expected_wins", ascending=False).iterrows():
+            print(f"  {row['team_name']:<30} W {row['expected_wins']:5.1f}  finals {row['p_finals']:6.1%}  "
+                  f"GF {row['p_grand_final']:6.1%}  premier {row['p_premier']:6.1%}")
+
+
+# -----------------------
+# compile / models
+# -----------------------
+def cmd_compile(args):
+    from .compile_season import compile_season, open_season, rate_season
+
+    start = time.perf_counter()
+    meta = compile_season(args.games, args.players, args.out_dir)
+    print(f"Compiled {meta['n_games']} games / {meta['n_lines']} player lines to {args.out_dir} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    season = open_season(args.out_dir)
+    rate_season(season, batch_by=args.batch_by)
+    print(f"Rated {len(season.players)} players from the artifact ({args.batch_by} blocks) in {time.perf_counter() - start:.3f}s")
+
+
+def cmd_fit(args):
+    from .batch_fit import run
+
+    start = time.perf_counter()
+    df, iterations = run(args.season, args.out, ridge=args.ridge, warm=not args.cold)
+    print(f"Fitted {len(df)} players over the whole season in {time.perf_counter() - start:.2f}s "
+          f"({iterations} lsqr iterations). Saved to {args.out}")
+    print(df.sort_values("ELO", ascending=False).head(10)[["player_name", "team_name", "ELO"]].to_string(index=False))
+
+
+def cmd_models(args):
+    from .compile_season import open_season
+    from .rating_models import ShareElo, TeamResultElo, Glicko2, run_models, ratings_table
+
+    season = open_season(args.season)
+    models = [ShareElo(), TeamResultElo(), Glicko2()]
+
+    start = time.perf_counter()
+    states = run_models(season, models)
+    elapsed = time.perf_counter() - start
+
+    df = ratings_table(season, models, states)
+    df.to_csv(args.out, index=False)
+    print(f"Ran {len(models)} models over {season.n_games} games in one pass ({elapsed:.3f}s). Saved to {args.out}")
+    for model in models:
+        print(f"\nTop 10 by {model.name}:")
+        print(df.sort_values(model.name, ascending=False).head(10)[["player_name", model.name]].to_string(index=False))
+
+
+# -----------------------
+# Parser
+# -----------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="elo_tracker", description="Basketball player & team ELO tracker.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("scrape", help="scrape games and box scores from PlayHQ")
+    p.add_argument("--start-page", help="league/season page to start from")
+    p.add_argument("--with-ratings", action="store_true", help="update player ELOs while scraping")
+    p.add_argument("--retry-failed", action="store_true", help="only re-scrape pages in the failure ledger")
+    p.add_argument("--full", action="store_true", help="ignore the saved round state and re-render every page")
+    p.add_argument("--future-fixtures", action="store_true",
+                   help="keep listing every future round (needed by simulate for full-season odds)")
+    p.set_defaults(func=cmd_scrape)
+
+    p = sub.add_parser("rate", help="compute player and team ELOs from the scraped CSVs")
+    p.add_argument("--games", default=GAMES_CSV)
+    p.add_argument("--players", default=PLAYERS_CSV)
+    p.add_argument("--out-dir", default="data")
+    p.add_argument("--model", choices=["share", "team-result"], default="share")
+    p.add_argument("--batch-by", choices=["game", "date", "round"], default="game",
+                   help="rate each date's / grade round's games simultaneously from the pre-block ratings")
+    p.add_argument("--stream", action="store_true", help="bounded-memory chunked run (same outputs)")
+    p.add_argument("--chunksize", type=int, default=200_000)
+    p.add_argument("--tmp-dir", default=None, help="where sorted runs are spilled when streaming")
+    p.add_argument("--verbose", action="store_true")
+    p.add_argument("--feed", nargs="?", const="data/feed", default=None,
+                   help="append newly rated games' changes to this change feed (default dir: data/feed)")
+    p.set_defaults(func=cmd_rate)
+
+    p = sub.add_parser("feed", help="read the rating change feed")
+    p.add_argument("action", choices=["tail", "replay", "cursors"])
+    p.add_argument("--dir", default="data/feed")
+    p.add_argument("--consumer", default="default", help="cursor name for tail")
+    p.add_argument("--offset", type=int, default=0, help="replay from this offset")
+    p.add_argument("--limit", type=int, default=None)
+    p.add_argument("--peek", action="store_true", help="tail without moving the cursor")
+    p.set_defaults(func=cmd_feed)
+
+    p = sub.add_parser("teams", help="list teams by rating")
+    p.add_argument("--team-elo", default=TEAM_ELO_CSV)
+    p.add_argument("--by", choices=["ELO", "rolling_ELO"], default="ELO")
+    p.add_argument("--top", type=int, default=0, help="only show the top N teams")
+    p.set_defaults(func=cmd_teams)
+
+    p = sub.add_parser("search", help="find players and teams by (approximate) name")
+    p.add_argument("query", nargs="+")
+    p.add_argument("--index", default="data/search")
+    p.add_argument("--kind", choices=["player", "team"], default=None)
+    p.add_argument("--by", choices=["rating", "recency"], default="rating", help="ranking within each match tier")
+    p.add_argument("--limit", type=int, default=10)
+    p.add_argument("--no-fuzzy", action="store_true", help="exact and prefix matches only")
+    p.add_argument("--timing", action="store_true")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("predict", help="predict upcoming fixtures or one explicit matchup")
+    p.add_argument("--games", default=GAMES_CSV)
+    p.add_argument("--team-elo", default=TEAM_ELO_CSV)
+    p.add_argument("--player-elo", default=PLAYER_ELO_CSV)
+    p.add_argument("--out", default="data/predictions.csv")
+    p.add_argument("--home", help="home team id (predict a single explicit game)")
+    p.add_argument("--away", help="away team id")
+    p.add_argument("--home-lineup", help="comma-separated player names")
+    p.add_argument("--away-lineup", help="comma-separated player names")
+    p.add_argument("--home-advantage", type=float, default=0.0)
+    p.add_argument("--team-rating", choices=["ELO", "rolling_ELO"], default="ELO",
+                   help="team strength column from team_elo.csv")
+    p.set_defaults(func=cmd_predict)
+
+    p = sub.add_parser("simulate", help="Monte Carlo the rest of the season for ladder and finals odds")
+    p.add_argument("--games", default=GAMES_CSV)
+    p.add_argument("--team-elo", default=TEAM_ELO_CSV)
+    p.add_argument("--player-elo", default=PLAYER_ELO_CSV)
+    p.add_argument("--out", default="data/simulation.csv")
+    p.add_argument("--sims", type=int, default=100_000)
+    p.add_argument("--seed", type=int, default=2025)
+    p.add_argument("--workers", type=int, default=None, help="processes (default: all cores, 1 = no pool)")
+    p.add_argument("--batch-size", type=int, default=25_000, help="sims per task")
+    p.add_argument("--home-advantage", type=float, default=0.0)
+    p.add_argument("--team-rating", choices=["ELO", "rolling_ELO"], default="ELO")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("compile", help="compile the season into memory-mapped arrays")
+    p.add_argument("out_dir", nargs="?", default=SEASON_DIR)
+    p.add_argument("--games", default=GAMES_CSV)
+    p.add_argument("--players", default=PLAYERS_CSV)
+    p.add_argument("--batch-by", choices=["game", "date", "round"], default="game")
+    p.set_defaults(func=cmd_compile)
+
+    p = sub.add_parser("fit", help="order-independent whole-season ratings from one sparse least-squares solve")
+    p.add_argument("--season", default=SEASON_DIR)
+    p.add_argument("--out", default="data/batch_fit_elo.csv")
+    p.add_argument("--ridge", type=float, default=1.0, help="pull toward the grade offset, in player lines")
+    p.add_argument("--cold", action="store_true", help="don't warm-start from the previous fit in --out")
+    p.set_defaults(func=cmd_fit)
+
+    p = sub.add_parser("models", help="run every rating model over the compiled season in one pass")
+    p.add_argument("--season", default=SEASON_DIR)
+    p.add_argument("--out", default="data/model_ratings.csv")
+    p.set_defaults(func=cmd_models)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
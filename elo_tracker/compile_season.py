@@ -0,0 +1,222 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .rating import BASE_ELO, K_PLAYER, ELO_SCALE, FOUL_PENALTY, WIN_BONUS_PCT, MIN_PERF
+
+# ---------------------------
+# Config (hyperparameters come from rating.py)
+# ---------------------------
+GAMES_CSV = "data/full_season.csv"
+PLAYERS_CSV = "data/player_stats.csv"
+SEASON_DIR = "data/season"
+STAT_COLS = ['points', '1PM', '2PM', '3PM', 'fouls']
+
+# CSR layout: game g owns line slots game_offsets[g]:game_offsets[g + 1]
+GAME_ARRAYS = {
+    "game_offsets": np.int64,   # n_games + 1 row pointers into the line arrays
+    "game_date": np.int64,      # days since epoch
+    "game_grade": np.int32,     # index into meta["grades"]
+    "game_round": np.int32,     # index into meta["rounds"]
+    "game_home": np.int32,      # index into meta["teams"]
+    "game_away": np.int32,
+    "home_score": np.float64,
+    "away_score": np.float64,
+}
+LINE_ARRAYS = {
+    "player_idx": np.int32,     # index into meta["players"] (names, as rating.py keys players)
+    "player_id_idx": np.int32,  # index into meta["player_ids"] (PlayHQ ids, as team_result.py keys players)
+    "line_team": np.int32,      # index into meta["teams"]
+    "side": np.int8,            # 0 = home, 1 = away
+    "points": np.float64,
+    "raw_perf": np.float64,     # after win bonus and MIN_PERF floor
+    "S": np.float64,            # performance share within the game
+    "win": np.int8,             # 1 if the line's team won the game
+}
+
+
+# ---------------------------
+# Per-game preprocessing (rating independent)
+# ---------------------------
+def game_lines(players_in_game, home_team_id, away_team_id, home_score, away_score):
+    """Aggregate one game's player rows and add raw_perf / S exactly as rating.py does."""
+    agg_cols = {col: 'sum' for col in STAT_COLS if col in players_in_game.columns}
+    if 'player_id' in players_in_game.columns:
+        agg_cols['player_id'] = 'first'
+    if agg_cols:
+        lines = players_in_game.groupby(['player_name', 'team'], as_index=False).agg(agg_cols)
+    else:
+        lines = players_in_game[['player_name', 'team']].drop_duplicates()
+
+    pts = lines['points'].astype(float) if 'points' in lines.columns else 0.0
+    fouls = lines['fouls'].astype(float) if 'fouls' in lines.columns else 0.0
+    lines['raw_perf'] = np.maximum(pts - FOUL_PENALTY * fouls, MIN_PERF)
+
+    if home_score > away_score:
+        winning_team_id = home_team_id
+    elif away_score > home_score:
+        winning_team_id = away_team_id
+    else:
+        winning_team_id = None
+
+    lines['win'] = (lines['team'] == winning_team_id).astype(np.int8)
+    if winning_team_id is not None and WIN_BONUS_PCT != 0:
+        mask_win = lines['win'] == 1
+        lines.loc[mask_win, 'raw_perf'] = lines.loc[mask_win, 'raw_perf'] * (1.0 + WIN_BONUS_PCT)
+    lines['raw_perf'] = lines['raw_perf'].clip(lower=MIN_PERF)
+
+    total_perf = lines['raw_perf'].sum()
+    if total_perf <= 0:
+        lines['S'] = 1.0 / len(lines)
+    else:
+        lines['S'] = lines['raw_perf'] / total_perf
+    return lines
+
+
+def load_frames(games_csv=GAMES_CSV, players_csv=PLAYERS_CSV):
+    df_games = pd.read_csv(games_csv, dtype={"home_team_id": str, "away_team_id": str})
+    df_players = pd.read_csv(players_csv, dtype={"team": str, "player_id": str})
+    if 'forfeit' not in df_games.columns:
+        df_games['forfeit'] = False
+    df_games['date'] = pd.to_datetime(df_games['date'])
+    df_players['game_date'] = pd.to_datetime(df_players['game_date'])
+    df_games = df_games.sort_values(by='date', kind='mergesort')
+    return df_games, df_players
+
+
+# ---------------------------
+# Compile
+# ---------------------------
+def compile_season(games_csv=GAMES_CSV, players_csv=PLAYERS_CSV, out_dir=SEASON_DIR):
+    """Write the season as flat .npy arrays (CSR over games) plus a meta.json of labels."""
+    df_games, df_players = load_frames(games_csv, players_csv)
+
+    # one index lookup per (date, team) instead of a full-table filter per game
+    rows_by_date_team = df_players.groupby([df_players['game_date'].dt.date, 'team']).indices
+
+    players, player_ids, teams, grades, rounds = {}, {}, {}, {}, {}
+    team_names, player_id_names = {}, {}
+    game_cols = {name: [] for name in GAME_ARRAYS if name != "game_offsets"}
+    line_cols = {name: [] for name in LINE_ARRAYS}
+    offsets = [0]
+    game_keys = []
+
+    def code(table, key):
+        return table.setdefault(key, len(table))
+
+    for _, game in df_games.iterrows():
+        if game['forfeit']:
+            continue
+        home_id, away_id = game['home_team_id'], game['away_team_id']
+        day = game['date'].date()
+        positions = [rows_by_date_team.get((day, t)) for t in (home_id, away_id)]
+        positions = [p for p in positions if p is not None]
+        if not positions:
+            continue
+
+        home_score = game.get('home_score', 0)
+        away_score = game.get('away_score', 0)
+        lines = game_lines(df_players.iloc[np.concatenate(positions)], home_id, away_id, home_score, away_score)
+
+        team_names.setdefault(home_id, game.get('home_team', home_id))
+        team_names.setdefault(away_id, game.get('away_team', away_id))
+        game_cols["game_date"].append(game['date'].value // (86400 * 10**9))
+        game_cols["game_grade"].append(code(grades, str(game.get('grade', ''))))
+        game_cols["game_round"].append(code(rounds, str(game.get('round', ''))))
+        game_cols["game_home"].append(code(teams, home_id))
+        game_cols["game_away"].append(code(teams, away_id))
+        game_cols["home_score"].append(home_score)
+        game_cols["away_score"].append(away_score)
+        game_keys.append(str(game.get('box_score_link') or f"{day}:{home_id}:{away_id}"))
+
+        line_cols["player_idx"].extend(code(players, n) for n in lines['player_name'])
+        ids = lines['player_id'].astype(str) if 'player_id' in lines.columns else lines['player_name']
+        for pid, name in zip(ids, lines['player_name']):
+            player_id_names.setdefault(pid, name)
+            line_cols["player_id_idx"].append(code(player_ids, pid))
+        line_cols["line_team"].extend(code(teams, t) for t in lines['team'])
+        line_cols["side"].extend(0 if t == home_id else 1 for t in lines['team'])
+        line_cols["points"].extend(lines['points'] if 'points' in lines.columns else [0.0] * len(lines))
+        line_cols["raw_perf"].extend(lines['raw_perf'])
+        line_cols["S"].extend(lines['S'])
+        line_cols["win"].extend(lines['win'])
+        offsets.append(offsets[-1] + len(lines))
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "game_offsets.npy"), np.asarray(offsets, dtype=GAME_ARRAYS["game_offsets"]))
+    for name, values in game_cols.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), np.asarray(values, dtype=GAME_ARRAYS[name]))
+    for name, values in line_cols.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), np.asarray(values, dtype=LINE_ARRAYS[name]))
+
+    meta = {
+        "players": list(players),
+        "player_ids": list(player_ids),
+        "player_id_names": [player_id_names[p] for p in player_ids],
+        "teams": list(teams),
+        "team_names": [team_names.get(t, t) for t in teams],
+        "grades": list(grades),
+        "rounds": list(rounds),
+        "game_keys": game_keys,
+        "n_games": len(offsets) - 1,
+        "n_lines": offsets[-1],
+        "foul_penalty": FOUL_PENALTY,
+        "win_bonus_pct": WIN_BONUS_PCT,
+        "min_perf": MIN_PERF,
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    return meta
+
+
+# ---------------------------
+# Open (memory-mapped)
+# ---------------------------
+class Season:
+    """A compiled season opened read-only; every array is an np.memmap over its .npy file,
+    so worker processes share the page cache instead of copying."""
+
+    def __init__(self, path=SEASON_DIR):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        for name in list(GAME_ARRAYS) + list(LINE_ARRAYS):
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r'))
+        self.players = self.meta["players"]
+        self.player_ids = self.meta["player_ids"]
+        self.teams = self.meta["teams"]
+        self.n_games = self.meta["n_games"]
+
+    def __len__(self):
+        return self.n_games
+
+    def labels(self, index="player_idx"):
+        """Player labels for a line index array: names for player_idx, ids for player_id_idx."""
+        return self.player_ids if index == "player_id_idx" else self.players
+
+    def game_slice(self, g):
+        return slice(int(self.game_offsets[g]), int(self.game_offsets[g + 1]))
+
+
+def open_season(path=SEASON_DIR):
+    return Season(path)
+
+
+# ---------------------------
+# Rating run over the compiled arrays
+# ---------------------------
+def rate_season(season, k=K_PLAYER, scale=ELO_SCALE, init=BASE_ELO, batch_by="game"):
+    """Share-model ELO (same update as rating.py) over a compiled season.
+    init is a scalar or a per-player array (e.g. grade offsets); batch_by "date" or
+    "round" rates each block of games simultaneously from its pre-block ratings."""
+    from .rating_models import ShareElo, run_models, run_blocks
+
+    model = ShareElo(k=k, scale=scale, init=init)
+    if batch_by == "game":
+        state, = run_models(season, [model])
+    else:
+        state = run_blocks(season, model, batch_by)
+    return model.ratings(state)
+
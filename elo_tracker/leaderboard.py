@@ -0,0 +1,172 @@
+from bisect import bisect_left, insort
+
+# ---------------------------
+# Config
+# ---------------------------
+DEFAULT_TOP_K = 25
+LOAD = 256                # chunk size of the sorted containers
+
+
+# ---------------------------
+# Chunked sorted list (order statistics)
+# ---------------------------
+class SortedChunks:
+    """Sorted values split into chunks of at most 2 * load items, plus each chunk's max.
+
+    add / remove binary-search the chunk maxes (O(log n)) and then touch a
+    single chunk of bounded size, so an update never shifts the whole board.
+    Rank sums chunk lengths, which is O(n / load).
+    """
+
+    def __init__(self, load=LOAD):
+        self.load = load
+        self._lists = []
+        self._maxes = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def add(self, value):
+        if not self._lists:
+            self._lists.append([value])
+            self._maxes.append(value)
+        else:
+            pos = bisect_left(self._maxes, value)
+            if pos == len(self._maxes):
+                pos -= 1
+                self._lists[pos].append(value)
+                self._maxes[pos] = value
+            else:
+                insort(self._lists[pos], value)
+            if len(self._lists[pos]) > 2 * self.load:
+                chunk = self._lists[pos]
+                self._lists[pos:pos + 1] = [chunk[:self.load], chunk[self.load:]]
+                self._maxes[pos:pos + 1] = [chunk[self.load - 1], chunk[-1]]
+        self._len += 1
+
+    def remove(self, value):
+        pos = bisect_left(self._maxes, value)
+        chunk = self._lists[pos]
+        del chunk[bisect_left(chunk, value)]
+        if chunk:
+            self._maxes[pos] = chunk[-1]
+        else:
+            del self._lists[pos], self._maxes[pos]
+        self._len -= 1
+
+    def index(self, value):
+        pos = bisect_left(self._maxes, value)
+        return sum(len(c) for c in self._lists[:pos]) + bisect_left(self._lists[pos], value)
+
+    def head(self, k):
+        out = []
+        for chunk in self._lists:
+            if len(out) >= k:
+                break
+            out.extend(chunk[:k - len(out)])
+        return out
+
+
+# ---------------------------
+# Single sorted leaderboard
+# ---------------------------
+class Leaderboard:
+    """Ratings kept in descending order so top-K reads never need a full sort.
+
+    Entries are (-rating, key) tuples in a SortedChunks; updating a key is a
+    removal plus an insert, each O(log n) plus one bounded chunk.
+    """
+
+    def __init__(self):
+        self._entries = SortedChunks()   # (-rating, key)
+        self._rating = {}                # key -> current rating
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._rating
+
+    def update(self, key, rating):
+        old = self._rating.get(key)
+        if old is not None:
+            self._entries.remove((-old, key))
+        self._rating[key] = rating
+        self._entries.add((-rating, key))
+
+    def remove(self, key):
+        old = self._rating.pop(key, None)
+        if old is not None:
+            self._entries.remove((-old, key))
+
+    def rating(self, key, default=None):
+        return self._rating.get(key, default)
+
+    def top(self, k=DEFAULT_TOP_K):
+        """Return [(key, rating), ...] for the k highest ratings."""
+        return [(key, -neg) for neg, key in self._entries.head(k)]
+
+    def rank(self, key):
+        """1-based rank of key, or None if it is not on the board."""
+        old = self._rating.get(key)
+        if old is None:
+            return None
+        return self._entries.index((-old, key)) + 1
+
+
+# ---------------------------
+# Global / per-grade / per-team boards
+# ---------------------------
+class LeaderboardSet:
+    """Keeps global, per-grade and per-team player leaderboards current.
+
+    A player joins a grade/team board the first time they are seen there and
+    stays on it (matching the all-time roster used for team ELOs). Every
+    rating change is pushed to each board the player belongs to.
+    """
+
+    def __init__(self):
+        self.players = Leaderboard()
+        self.grades = {}        # grade -> Leaderboard
+        self.teams = {}         # team_id -> Leaderboard
+        self._memberships = {}  # player -> (set(grades), set(teams))
+
+    def update(self, player, rating, grade=None, team=None):
+        grades, teams = self._memberships.setdefault(player, (set(), set()))
+        if grade is not None:
+            grades.add(grade)
+        if team is not None:
+            teams.add(team)
+
+        self.players.update(player, rating)
+        for g in grades:
+            self.grades.setdefault(g, Leaderboard()).update(player, rating)
+        for t in teams:
+            self.teams.setdefault(t, Leaderboard()).update(player, rating)
+
+    def top(self, k=DEFAULT_TOP_K):
+        return self.players.top(k)
+
+    def top_in_grade(self, grade, k=DEFAULT_TOP_K):
+        board = self.grades.get(grade)
+        return board.top(k) if board is not None else []
+
+    def top_in_team(self, team, k=5):
+        board = self.teams.get(team)
+        return board.top(k) if board is not None else []
+
+    def team_rating(self, team, k=5, default=None):
+        """Mean of the team's top-k player ratings (the classic team ELO)."""
+        top = self.top_in_team(team, k)
+        if not top:
+            return default
+        return sum(r for _, r in top) / len(top)
+
+    def snapshot(self, k=DEFAULT_TOP_K, grade=None):
+        """Copy of the current top-k boards for a per-round dump (one grade's board if grade is given)."""
+        grades = list(self.grades) if grade is None else [grade]
+        return {
+            "global": self.top(k),
+            "grades": {g: self.top_in_grade(g, k) for g in grades},
+        }
@@ -0,0 +1,188 @@
+import json
+import os
+import random
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from .browser import page_transfer_bytes, driver_memory
+
+# -----------------------
+# Configuration
+# -----------------------
+LEDGER_PATH = "data/failed_pages.json"
+BREAKER_THRESHOLD = 3     # distinct URLs failing in a row before the driver is recreated
+
+
+# -----------------------
+# Retry policy per page type
+# -----------------------
+class RetryPolicy:
+    """Exponential backoff with jitter; timeout is the per-attempt explicit wait."""
+
+    def __init__(self, attempts=3, timeout=6, base_delay=1.0, max_delay=20.0, jitter=0.5):
+        self.attempts = attempts
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return backoff * (1.0 - self.jitter + random.random() * self.jitter)
+
+
+POLICIES = {
+    "grade": RetryPolicy(attempts=3, timeout=10, base_delay=2.0),
+    "fixtures": RetryPolicy(attempts=4, timeout=6, base_delay=1.0),
+    "box_score": RetryPolicy(attempts=3, timeout=6, base_delay=1.0),
+}
+
+
+# -----------------------
+# Persisted failure ledger
+# -----------------------
+class FailureLedger:
+    """URLs that are still failing after all retries, with enough context to re-scrape them.
+
+    Shared by all scraper threads; written to disk on every change so a crash
+    still leaves an accurate ledger for the follow-up run.
+    """
+
+    def __init__(self, path=LEDGER_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def record(self, url, page_type, context, error):
+        with self.lock:
+            entry = self.entries.setdefault(url, {"page_type": page_type, "context": context, "failures": 0})
+            entry["failures"] += 1
+            entry["last_error"] = str(error).strip().splitlines()[0] if str(error).strip() else type(error).__name__
+            entry["failed_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            self._save()
+
+    def resolve(self, url):
+        with self.lock:
+            if self.entries.pop(url, None) is not None:
+                self._save()
+
+    def pending(self, page_type=None):
+        with self.lock:
+            return [(url, e) for url, e in self.entries.items() if page_type is None or e["page_type"] == page_type]
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# -----------------------
+# Page loader with retries and a driver circuit breaker
+# -----------------------
+class PageLoader:
+    """Owns one thread's driver. load() retries with backoff, recreates the driver once
+    BREAKER_THRESHOLD distinct URLs in a row have failed, and records pages that never load
+    in the ledger. Retries of one bad page count once, so a single dead link never restarts
+    the browser."""
+
+    def __init__(self, driver_factory, ledger=None, policies=None, breaker_threshold=BREAKER_THRESHOLD):
+        self.driver_factory = driver_factory
+        self.ledger = ledger
+        self.policies = policies or POLICIES
+        self.breaker_threshold = breaker_threshold
+        self.failing_urls = set()   # distinct URLs failed since the last successful load
+        self.pages = 0
+        self.bytes_transferred = 0
+        self.peak_js_heap = 0
+        self.peak_rss = None
+        self.driver = driver_factory()
+
+    def load(self, url, page_type, wait_css=None, context=None, may_be_empty=False):
+        """Load url until wait_css is present; True on success.
+
+        With may_be_empty, a page that finished loading but never showed
+        wait_css also counts as loaded (e.g. a box score with no stats table):
+        it is not retried, does not trip the breaker and is not recorded.
+        """
+        policy = self.policies[page_type]
+        last_error = None
+        for attempt in range(policy.attempts):
+            try:
+                self.driver.get(url)
+                if wait_css:
+                    try:
+                        WebDriverWait(self.driver, policy.timeout).until(
+                            EC.presence_of_all_elements_located((By.CSS_SELECTOR, wait_css))
+                        )
+                    except TimeoutException:
+                        if not (may_be_empty and self._page_complete()):
+                            raise
+                self._loaded(url)
+                return True
+            except Exception as e:
+                last_error = e
+                self._trip(url)
+                if attempt + 1 < policy.attempts:
+                    wait = policy.delay(attempt)
+                    print(f"Retry {attempt + 1}/{policy.attempts - 1} for {page_type} {url} in {wait:.1f}s")
+                    time.sleep(wait)
+
+        print(f"Giving up on {page_type} {url}: {type(last_error).__name__}")
+        if self.ledger is not None:
+            self.ledger.record(url, page_type, context, last_error)
+        return False
+
+    def _page_complete(self):
+        try:
+            return self.driver.execute_script("return document.readyState") == "complete"
+        except Exception:
+            return False
+
+    def _loaded(self, url):
+        self.failing_urls.clear()
+        self._measure()
+        if self.ledger is not None:
+            self.ledger.resolve(url)
+
+    def _trip(self, url):
+        self.failing_urls.add(url)
+        if len(self.failing_urls) < self.breaker_threshold:
+            return
+        print("Driver looks wedged, recreating it")
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = self.driver_factory()
+        self.failing_urls.clear()
+
+    def _measure(self):
+        self.pages += 1
+        self.bytes_transferred += page_transfer_bytes(self.driver)
+        js_heap, rss = driver_memory(self.driver)
+        self.peak_js_heap = max(self.peak_js_heap, js_heap)
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, rss)
+
+    def report(self):
+        mb = 1024 * 1024
+        rss = f"{self.peak_rss / mb:.0f} MB" if self.peak_rss is not None else "n/a"
+        return (f"{self.pages} pages, {self.bytes_transferred / mb:.1f} MB transferred, "
+                f"peak JS heap {self.peak_js_heap / mb:.0f} MB, peak browser RSS {rss}")
+
+    def quit(self):
+        print(f"Driver stats: {self.report()}")
+        self.driver.quit()
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Config
+# ---------------------------
+BASE_ELO = 1500           # rating used for teams/players we have never seen
+ELO_SCALE = 400.0         # same scale as the player model
+HOME_ADVANTAGE = 0.0      # ELO points added to the home side (0 = neutral courts)
+TEAM_TOP_N = 5            # lineup rating = mean of this many best listed players
+
+GAMES_CSV = "data/full_season.csv"
+TEAM_ELO_CSV = "data/team_elo.csv"
+PLAYER_ELO_CSV = "data/player_elo.csv"
+PREDICTIONS_CSV = "data/predictions.csv"
+
+ID_COLS = {"home_team_id": str, "away_team_id": str, "team_id": str}
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def win_probability(diff, scale=ELO_SCALE):
+    """Vectorized logistic ELO curve: P(home win) for an array of rating differences."""
+    return 1.0 / (1.0 + np.power(10.0, -np.asarray(diff, dtype=float) / scale))
+
+
+def lineup_rating(names, player_elo, top_n=TEAM_TOP_N):
+    """Mean of the top_n ratings among the listed players (unknown players get BASE_ELO)."""
+    elos = sorted((player_elo.get(n, BASE_ELO) for n in names), reverse=True)[:top_n]
+    return float(np.mean(elos)) if elos else np.nan
+
+
+def load_ratings(team_csv=TEAM_ELO_CSV, player_csv=PLAYER_ELO_CSV, team_col="ELO"):
+    """team_col picks the team strength: "ELO" (top-5 roster) or "rolling_ELO" (recent lineups)."""
+    df_team = pd.read_csv(team_csv, dtype=ID_COLS)
+    team_elo = dict(zip(df_team["team_id"], df_team[team_col]))
+    try:
+        df_player = pd.read_csv(player_csv, dtype=ID_COLS)
+        player_elo = dict(zip(df_player["player_name"], df_player["ELO"]))
+    except FileNotFoundError:
+        player_elo = {}
+    return team_elo, player_elo
+
+
+def past_forfeits(df_games):
+    """Rows scraped as forfeit=True but dated before their grade's last played game.
+
+    The scrapers mark every fixture without a parsed score as a forfeit; one
+    dated before a game that has a score was a real forfeit, not a fixture
+    still to come.
+    """
+    if "forfeit" not in df_games.columns or "date" not in df_games.columns:
+        return pd.Series(False, index=df_games.index)
+    forfeit = df_games["forfeit"].astype(bool)
+    played = ~forfeit & df_games["home_score"].notna() & df_games["away_score"].notna()
+    dates = pd.to_datetime(df_games["date"], errors="coerce")
+    grade = df_games["grade"] if "grade" in df_games.columns else pd.Series(0, index=df_games.index)
+    last_played = dates.where(played).groupby(grade).transform("max")
+    return forfeit & (dates < last_played)
+
+
+def upcoming_fixtures(games_csv=GAMES_CSV):
+    """Scraped fixtures with no parsed score (recorded by the scrapers as forfeit=True), minus past forfeits."""
+    df_games = pd.read_csv(games_csv, dtype=ID_COLS)
+    if "forfeit" not in df_games.columns:
+        return df_games.iloc[0:0]
+    unplayed = df_games["forfeit"].astype(bool) | df_games["home_score"].isna()
+    return df_games[unplayed & ~past_forfeits(df_games)].reset_index(drop=True)
+
+
+# ---------------------------
+# Batch prediction
+# ---------------------------
+def predict_games(fixtures, team_elo, player_elo=None, home_advantage=HOME_ADVANTAGE):
+    """Score every fixture in one vectorized pass.
+
+    fixtures needs home_team_id / away_team_id columns; optional home_lineup /
+    away_lineup columns (lists of player names) override the team rating for
+    that side with the lineup rating.
+    """
+    out = fixtures.copy()
+    home_elo = np.array(out["home_team_id"].map(team_elo).astype(float).fillna(BASE_ELO), dtype=float)
+    away_elo = np.array(out["away_team_id"].map(team_elo).astype(float).fillna(BASE_ELO), dtype=float)
+
+    if player_elo:
+        for col, elos in (("home_lineup", home_elo), ("away_lineup", away_elo)):
+            if col not in out.columns:
+                continue
+            for i, names in enumerate(out[col]):
+                if isinstance(names, (list, tuple)) and names:
+                    elos[i] = lineup_rating(names, player_elo)
+
+    diff = home_elo + home_advantage - away_elo
+    p_home = win_probability(diff)
+
+    out["home_elo"] = home_elo
+    out["away_elo"] = away_elo
+    out["elo_diff"] = diff
+    out["home_win_prob"] = p_home
+    out["away_win_prob"] = 1.0 - p_home
+    out["predicted_winner"] = np.where(p_home >= 0.5, out["home_team_id"], out["away_team_id"])
+    return out
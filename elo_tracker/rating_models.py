@@ -0,0 +1,306 @@
+from collections import namedtuple
+
+import numpy as np
+
+# ---------------------------
+# One game's participants, sliced out of the compiled season (see compile_season.py)
+# ---------------------------
+GameView = namedtuple("GameView", ["idx", "S", "side", "points", "win", "home_score", "away_score"])
+
+
+def team_results(game):
+    """(home_result, away_result) as 1 / 0 / 0.5 from the game score."""
+    if game.home_score > game.away_score:
+        return 1.0, 0.0
+    if game.away_score > game.home_score:
+        return 0.0, 1.0
+    return 0.5, 0.5
+
+
+# ---------------------------
+# Model interface
+# ---------------------------
+class RatingModel:
+    """A rating model is a state factory plus a batched per-game kernel.
+
+    init_state(n_players) returns a dict of NumPy arrays indexed by player;
+    update(state, game) applies one game in place using array operations over
+    the game's participants; ratings(state) returns the headline rating array.
+    index names the season line array that identifies players for this model.
+    """
+
+    name = "model"
+    index = "player_idx"
+
+    def init_state(self, n_players):
+        raise NotImplementedError
+
+    def update(self, state, game):
+        raise NotImplementedError
+
+    def ratings(self, state):
+        return state["rating"]
+
+    def columns(self, state):
+        """Output columns for the ratings table."""
+        return {self.name: self.ratings(state)}
+
+
+# ---------------------------
+# Share-based player ELO (rating.py)
+# ---------------------------
+class ShareElo(RatingModel):
+    name = "share_elo"
+
+    def __init__(self, k=30, scale=400.0, init=1500):
+        self.k = k
+        self.scale = scale
+        self.init = init  # scalar or per-player array (e.g. grade offsets)
+
+    def init_state(self, n_players):
+        return {"rating": np.array(np.broadcast_to(self.init, n_players), dtype=float)}
+
+    def update(self, state, game):
+        ratings = state["rating"]
+        exps = np.power(10.0, ratings[game.idx] / self.scale)
+        E = exps / exps.sum()
+        # add.at so a name listed twice in one game gets both deltas, like the dict loop
+        np.add.at(ratings, game.idx, self.k * (game.S - E))
+
+    def update_block(self, state, idx, S, counts):
+        """Rate several games at once from the same starting ratings.
+
+        idx / S hold the games' lines back to back and counts the lines per game;
+        each game's softmax denominator is one reduceat segment.
+        """
+        ratings = state["rating"]
+        exps = np.power(10.0, ratings[idx] / self.scale)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        E = exps / np.repeat(np.add.reduceat(exps, starts), counts)
+        np.add.at(ratings, idx, self.k * (S - E))
+
+
+# ---------------------------
+# Team-result player ELO (team_result.py)
+# ---------------------------
+class TeamResultElo(RatingModel):
+    name = "team_result_elo"
+    index = "player_id_idx"   # keyed by PlayHQ player id, like team_result.py
+
+    def __init__(self, k=32, init=1200, league_avg=1200.0):
+        self.k = k
+        self.init = init
+        self.league_avg = league_avg
+
+    def init_state(self, n_players):
+        return {"rating": np.full(n_players, float(self.init))}
+
+    def update(self, state, game):
+        ratings = state["rating"]
+        home = game.side == 0
+        away = ~home
+        if not home.any() or not away.any():
+            return
+
+        team_elo = np.where(home, ratings[game.idx][home].mean(), ratings[game.idx][away].mean())
+        opp_elo = np.where(home, ratings[game.idx][away].mean(), ratings[game.idx][home].mean())
+        home_result, away_result = team_results(game)
+        result = np.where(home, home_result, away_result)
+        team_points = np.where(home, game.home_score, game.away_score)
+
+        expected = 1.0 / (1.0 + np.power(10.0, (opp_elo - team_elo) / 400.0))
+        perf_share = game.points / np.maximum(1.0, team_points)
+        perf_factor = np.log1p(game.points) * (opp_elo / self.league_avg)
+        np.add.at(ratings, game.idx, self.k * (result - expected) * perf_share * perf_factor)
+
+
+# ---------------------------
+# Glicko-2 (each player vs the opposing lineup as one composite opponent)
+# ---------------------------
+GLICKO_SCALE = 173.7178
+
+
+class Glicko2(RatingModel):
+    """Glicko-2 with one rating period per game.
+
+    Each player's opponent is the opposing lineup: mean mu and RMS phi of its
+    players. The outcome is the team result, so players carry a rating
+    deviation and volatility that the ELO models lack.
+    """
+
+    name = "glicko2"
+
+    def __init__(self, init=1500.0, rd=350.0, vol=0.06, tau=0.5, eps=1e-6):
+        self.init = init
+        self.rd = rd
+        self.vol = vol
+        self.tau = tau
+        self.eps = eps
+
+    def init_state(self, n_players):
+        return {
+            "mu": np.zeros(n_players),
+            "phi": np.full(n_players, self.rd / GLICKO_SCALE),
+            "sigma": np.full(n_players, self.vol),
+        }
+
+    def ratings(self, state):
+        return state["mu"] * GLICKO_SCALE + self.init
+
+    def columns(self, state):
+        return {self.name: self.ratings(state), f"{self.name}_rd": state["phi"] * GLICKO_SCALE}
+
+    def _volatility(self, phi, sigma, v, delta):
+        """Vectorized Illinois iteration from step 5 of the Glicko-2 paper."""
+        tau2 = self.tau ** 2
+        a = np.log(sigma ** 2)
+
+        def f(x):
+            ex = np.exp(x)
+            return ex * (delta ** 2 - phi ** 2 - v - ex) / (2.0 * (phi ** 2 + v + ex) ** 2) - (x - a) / tau2
+
+        A = a.copy()
+        big = delta ** 2 > phi ** 2 + v
+        B = np.where(big, np.log(np.maximum(delta ** 2 - phi ** 2 - v, 1e-300)), a - self.tau)
+        k = np.ones_like(a)
+        small = ~big & (f(a - k * self.tau) < 0)
+        while small.any():
+            k[small] += 1
+            small &= f(a - k * self.tau) < 0
+        B = np.where(big, B, a - k * self.tau)
+
+        fA, fB = f(A), f(B)
+        active = np.abs(B - A) > self.eps
+        with np.errstate(divide="ignore", invalid="ignore"):  # converged lanes may divide by zero
+            for _ in range(100):
+                if not active.any():
+                    break
+                C = A + (A - B) * fA / (fB - fA)
+                fC = f(C)
+                swap = active & (fC * fB <= 0)
+                halve = active & ~swap
+                A = np.where(swap, B, A)
+                fA = np.where(swap, fB, np.where(halve, fA / 2.0, fA))
+                B = np.where(active, C, B)
+                fB = np.where(active, fC, fB)
+                active &= np.abs(B - A) > self.eps
+        return np.exp(A / 2.0)
+
+    def update(self, state, game):
+        home = game.side == 0
+        away = ~home
+        if not home.any() or not away.any():
+            return
+        idx = game.idx
+        mu, phi, sigma = state["mu"][idx], state["phi"][idx], state["sigma"][idx]
+
+        opp_mu = np.where(home, mu[away].mean(), mu[home].mean())
+        opp_phi = np.where(home, np.sqrt((phi[away] ** 2).mean()), np.sqrt((phi[home] ** 2).mean()))
+        home_result, away_result = team_results(game)
+        s = np.where(home, home_result, away_result)
+
+        g = 1.0 / np.sqrt(1.0 + 3.0 * opp_phi ** 2 / np.pi ** 2)
+        E = 1.0 / (1.0 + np.exp(-g * (mu - opp_mu)))
+        v = 1.0 / (g ** 2 * E * (1.0 - E))
+        delta = v * g * (s - E)
+
+        new_sigma = self._volatility(phi, sigma, v, delta)
+        phi_star = np.sqrt(phi ** 2 + new_sigma ** 2)
+        new_phi = 1.0 / np.sqrt(1.0 / phi_star ** 2 + 1.0 / v)
+        state["mu"][idx] = mu + new_phi ** 2 * g * (s - E)
+        state["phi"][idx] = new_phi
+        state["sigma"][idx] = new_sigma
+
+
+# ---------------------------
+# Shared driver: one pass over the games, every model updated per game
+# ---------------------------
+def run_models(season, models):
+    """Run several models over one scan of a compiled season; returns one state per model."""
+    states = [m.init_state(len(season.labels(m.index))) for m in models]
+    offsets = np.asarray(season.game_offsets)
+    indices = {m.index: np.asarray(getattr(season, m.index)) for m in models}
+    S = np.asarray(season.S)
+    side = np.asarray(season.side)
+    points = np.asarray(season.points)
+    win = np.asarray(season.win)
+    home_score = np.asarray(season.home_score)
+    away_score = np.asarray(season.away_score)
+
+    for g in range(season.n_games):
+        a, b = offsets[g], offsets[g + 1]
+        views = {key: GameView(idx[a:b], S[a:b], side[a:b], points[a:b], win[a:b], home_score[g], away_score[g])
+                 for key, idx in indices.items()}
+        for model, state in zip(models, states):
+            model.update(state, views[model.index])
+    return states
+
+
+# ---------------------------
+# Simultaneous updates: every game in a block is rated from the pre-block ratings
+# ---------------------------
+BATCH_BY = ("game", "date", "round")
+
+
+def update_blocks(season, by="date"):
+    """Game indices per block, in play order.
+
+    "game" is one game per block (the sequential model), "date" groups the
+    games of each day, and "round" groups each grade's round, ordered by the
+    round's first game.
+    """
+    n = season.n_games
+    if by == "game":
+        return np.split(np.arange(n), np.arange(1, n))
+    if by == "date":
+        order = np.arange(n)
+        key = np.asarray(season.game_date)
+    elif by == "round":
+        key = np.asarray(season.game_grade, dtype=np.int64) * len(season.meta["rounds"]) + season.game_round
+        _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+        order = np.argsort(first[inverse], kind="stable")   # games are date-sorted, so first = earliest
+        key = key[order]
+    else:
+        raise ValueError(f"batch_by must be one of {BATCH_BY}, got {by!r}")
+    return np.split(order, np.flatnonzero(np.diff(key)) + 1)
+
+
+def run_blocks(season, model, by="date", on_block=None):
+    """Run one block-capable model (ShareElo) over the season a block at a time.
+
+    on_block(games, state) is called after each block's deltas are applied.
+    """
+    state = model.init_state(len(season.labels(model.index)))
+    offsets = np.asarray(season.game_offsets)
+    player_idx = np.asarray(getattr(season, model.index))
+    S = np.asarray(season.S)
+
+    for games in update_blocks(season, by):
+        starts = offsets[games]
+        counts = offsets[games + 1] - starts
+        keep = counts > 0
+        games, starts, counts = games[keep], starts[keep], counts[keep]
+        if not len(games):
+            continue
+        # line numbers of all the block's games, back to back
+        lines = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts) + np.arange(counts.sum())
+        model.update_block(state, player_idx[lines], S[lines], counts)
+        if on_block is not None:
+            on_block(games, state)
+    return state
+
+
+def ratings_table(season, models, states):
+    """One row per player id; name-keyed models are looked up through each id's name."""
+    import pandas as pd
+
+    name_of_id = np.zeros(len(season.player_ids), dtype=np.int64)
+    name_of_id[np.asarray(season.player_id_idx)] = season.player_idx
+    table = {"player_id": season.player_ids, "player_name": season.meta["player_id_names"]}
+    for model, state in zip(models, states):
+        columns = model.columns(state)
+        if model.index == "player_idx":
+            columns = {name: values[name_of_id] for name, values in columns.items()}
+        table.update(columns)
+    return pd.DataFrame(table)
+
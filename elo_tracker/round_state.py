@@ -0,0 +1,67 @@
+import json
+import os
+import threading
+
+# -----------------------
+# Configuration
+# -----------------------
+STATE_PATH = "data/scrape_state.json"
+
+
+def has_result(game):
+    return not game['forfeit'] and game['home_score'] is not None
+
+
+# -----------------------
+# Persisted per-round scrape state
+# -----------------------
+class RoundState:
+    """What the previous run saw for each (grade, round URL).
+
+    Each entry keeps the fixture rows, the score each box score was fetched
+    at, and whether the round is final (every game has a result and its box
+    score). Final rounds are never reloaded.
+    """
+
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.grades = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.grades = json.load(f)
+
+    def get(self, grade, round_url):
+        with self.lock:
+            return self.grades.get(grade, {}).get(round_url)
+
+    def round_urls(self, grade):
+        """Round URLs seen for grade in earlier runs, in the order they were listed."""
+        with self.lock:
+            return list(self.grades.get(grade, {}))
+
+    def put(self, grade, round_url, round_games, fetched_scores, final):
+        with self.lock:
+            self.grades.setdefault(grade, {})[round_url] = {
+                "games": round_games,
+                "fetched_scores": fetched_scores,  # box_score_link -> [home, away] at fetch time
+                "final": final,
+            }
+
+    def needs_box_score(self, grade, round_url, game, have_rows):
+        """True if the game has a result we have not fetched, or its score changed since."""
+        if not has_result(game):
+            return False
+        if not have_rows:
+            return True
+        entry = self.get(grade, round_url) or {}
+        fetched = entry.get("fetched_scores", {}).get(game['box_score_link'])
+        return fetched != [game['home_score'], game['away_score']]
+
+    def save(self):
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.grades, f)
+            os.replace(tmp, self.path)
@@ -0,0 +1,381 @@
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import ElementClickInterceptedException
+import pandas as pd
+import os
+import time
+import threading
+from .browser import create_driver
+from .page_loader import PageLoader, FailureLedger
+from .round_state import RoundState, has_result
+from .buffers import RowBuffer, StringPool, GAME_COLUMNS, PLAYER_COLUMNS
+
+# -----------------------
+# Configuration
+# -----------------------
+BASE = "https://www.playhq.com"
+START_PAGE = "https://www.playhq.com/basketball-victoria/org/balwyn-blazers-basketball-association-senior-competition/winter-2025/b9a20da8"
+
+GAMES_CSV = "data/full_season.csv"
+PLAYERS_CSV = "data/player_stats.csv"
+STRING_DTYPES = {name: str for name, kind in {**GAME_COLUMNS, **PLAYER_COLUMNS}.items() if kind == "s"}
+FETCH_FUTURE_FIXTURES = False                # True = keep listing rounds after the first future one
+
+# Columnar, thread-safe row buffers (recreated by run()); player rows are flushed to disk in chunks
+pool = StringPool()
+all_games = RowBuffer(GAME_COLUMNS, key="box_score_link", path=GAMES_CSV, pool=pool)
+all_players = RowBuffer(PLAYER_COLUMNS, key="box_score_link", path=PLAYERS_CSV, pool=pool)
+ledger = None            # FailureLedger, opened by run()
+state = None             # RoundState, opened by run()
+previous_players = RowBuffer(PLAYER_COLUMNS, key="box_score_link", pool=pool)  # rows saved by the last run
+
+# -----------------------
+# Step 1: Collect all grades
+# -----------------------
+def collect_grades(start_page=START_PAGE):
+    loader = PageLoader(create_driver, ledger)
+    loader.load(start_page, "grade", wait_css="h2", context={"start_page": start_page})
+    driver = loader.driver
+
+    grades_info = []
+    grade_elements = driver.find_elements(By.CSS_SELECTOR, "a[data-testid^='grade-']")
+    for grade_el in grade_elements:
+        try:
+            grade_name = grade_el.find_element(By.TAG_NAME, "span").text.strip()
+            grade_url = grade_el.get_attribute("href")
+            grades_info.append((grade_name, grade_url))
+        except Exception as e:
+            print("Error collecting grade info:", e)
+
+    if not grades_info:
+        active_grade_el = driver.find_element(By.CSS_SELECTOR, "h2 span")
+        grades_info.append((active_grade_el.text.strip(), driver.current_url))
+
+    print(f"Found grades: {[g[0] for g in grades_info]}")
+    loader.quit()
+    return grades_info
+
+# -----------------------
+# Scrape one round's fixtures
+# -----------------------
+def scrape_round(loader, grade_name, r_name, r_url):
+    """The round's fixture rows, or None if the listing failed to load."""
+    print(f"Scraping fixtures for {grade_name} - {r_name}")
+    context = {"grade": grade_name, "round": r_name}
+    if not loader.load(r_url, "fixtures", wait_css="[data-testid='games-on-date']", context=context):
+        return None
+    driver = loader.driver
+
+    try:
+        grade_header = driver.find_element(By.TAG_NAME, "h2").text.strip()
+    except:
+        grade_header = grade_name
+
+    try:
+        round_header = driver.find_element(By.TAG_NAME, "h3").text.strip()
+    except:
+        round_header = r_name
+
+    round_games = []
+    date_blocks = driver.find_elements(By.CSS_SELECTOR, "[data-testid='games-on-date']")
+    for date_block in date_blocks:
+        try:
+            date_text = date_block.find_element(By.CSS_SELECTOR, "span").text.strip()
+        except:
+            date_text = "Unknown Date"
+
+        games = date_block.find_elements(By.CSS_SELECTOR, "div.sc-1uurivg-5.iSzlTC")
+        for game_div in games:
+            try:
+                teams = game_div.find_elements(By.CSS_SELECTOR, "a.sc-9jw1ry-3")
+                scores = game_div.find_elements(By.CSS_SELECTOR, "span.sc-1uurivg-10")
+                fixture_btn = game_div.find_element(By.CSS_SELECTOR, "a[data-testid^='fixture-button-']")
+                box_score_link = fixture_btn.get_attribute("href")
+                if not box_score_link.startswith("http"):
+                    box_score_link = BASE + box_score_link
+
+                home_team = teams[0].text.strip()
+                away_team = teams[1].text.strip()
+                home_team_id = teams[0].get_attribute("href").split("/")[-1]
+                away_team_id = teams[1].get_attribute("href").split("/")[-1]
+
+                try:
+                    home_score = int(scores[0].text.strip())
+                    away_score = int(scores[1].text.strip())
+                    forfeit = False
+                except:
+                    home_score = None
+                    away_score = None
+                    forfeit = True
+
+                round_games.append({
+                    "grade": grade_header,
+                    "round": round_header,
+                    "date": date_text,
+                    "home_team": home_team,
+                    "home_team_id": home_team_id,
+                    "away_team": away_team,
+                    "away_team_id": away_team_id,
+                    "home_score": home_score,
+                    "away_score": away_score,
+                    "forfeit": forfeit,
+                    "box_score_link": box_score_link
+                })
+            except Exception as e:
+                print("Error parsing game:", e)
+
+    return round_games
+
+def is_future_round(round_games):
+    """True if the round has fixtures and every one of them is dated after today."""
+    dates = pd.to_datetime(pd.Series([g['date'] for g in round_games], dtype=object), errors="coerce")
+    return len(dates) > 0 and dates.notna().all() and (dates > pd.Timestamp.today().normalize()).all()
+
+# -----------------------
+# Scrape one game's box score (old scrolling player stats method)
+# -----------------------
+def scrape_box_score(loader, game):
+    print(f"\nScraping players for game: {game['home_team']} vs {game['away_team']} ({game['round']})")
+    # a box score without a stats table is an empty result, not a failed load
+    if not loader.load(game['box_score_link'], "box_score", wait_css="table[data-testid^='stats-']",
+                       context=game, may_be_empty=True):
+        return []
+    driver = loader.driver
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    time.sleep(1)
+
+    # Click advanced stats if exists
+    try:
+        adv_button = driver.find_element(By.XPATH, "//button[.//span[text()='Show advanced stats']]")
+        try:
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", adv_button)
+            adv_button.click()
+            time.sleep(1)
+        except ElementClickInterceptedException:
+            driver.execute_script("arguments[0].click();", adv_button)
+            time.sleep(1)
+    except:
+        pass
+
+    game_players = []
+    tables = driver.find_elements(By.CSS_SELECTOR, "table[data-testid^='stats-']")
+    for table in tables:
+        team_id = table.get_attribute("data-testid").replace("stats-", "")
+        rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
+        for row in rows:
+            try:
+                cells = row.find_elements(By.TAG_NAME, "td")
+                if len(cells) < 6:
+                    continue
+                jersey = cells[0].text.strip()
+                player_a_tag = cells[1].find_element(By.TAG_NAME, "a")
+                player_name = player_a_tag.text.strip()
+                player_id = player_a_tag.get_attribute("href").split("/")[-2]
+
+                points = int(cells[2].text.strip() or 0)
+                one_pm = int(cells[3].text.strip() or 0)
+                two_pm = int(cells[4].text.strip() or 0)
+                three_pm = int(cells[5].text.strip() or 0)
+                fouls = int(cells[6].text.strip() or 0) if len(cells) > 6 else 0
+
+                game_players.append({
+                    "box_score_link": game['box_score_link'],
+                    "grade": game['grade'],
+                    "game_date": game['date'],
+                    "round": game['round'],
+                    "team": team_id,
+                    "player_id": player_id,
+                    "player_name": player_name,
+                    "jersey": jersey,
+                    "points": points,
+                    "1PM": one_pm,
+                    "2PM": two_pm,
+                    "3PM": three_pm,
+                    "fouls": fouls
+                })
+            except Exception as e:
+                print("Error parsing player row:", e)
+
+    return game_players
+
+# -----------------------
+# Scrape each grade (only rounds and box scores that changed since the last run)
+# -----------------------
+def load_previous_players():
+    if not os.path.exists(PLAYERS_CSV):
+        return
+    df_prev = pd.read_csv(PLAYERS_CSV, dtype=STRING_DTYPES)
+    if "box_score_link" not in df_prev.columns:
+        return  # written before change detection; everything is fetched once
+    previous_players.extend_frame(df_prev)
+
+def scrape_grade(grade_name, grade_url, full_refresh=False):
+    loader = PageLoader(create_driver, ledger)
+    print(f"\nScraping grade: {grade_name}")
+    grade_loaded = loader.load(grade_url, "grade", wait_css="h2", context={"grade": grade_name})
+    driver = loader.driver
+
+    # Detect rounds; if the grade page failed, fall back to the rounds seen in earlier runs
+    if grade_loaded:
+        round_elements = driver.find_elements(By.CSS_SELECTOR, "ul.sc-1odi71i-0 li a[data-testid^='page-']")
+        round_urls = [el.get_attribute("href") for el in round_elements]
+        round_names = [el.text.strip() for el in round_elements]
+    else:
+        round_urls = state.round_urls(grade_name)
+        round_names = [r.split("/")[-1] for r in round_urls]
+        print(f"{grade_name}: grade page failed to load; using {len(round_urls)} rounds from the last run")
+
+    if "R1" not in [r.split("/")[-1] for r in round_urls]:
+        round_urls.insert(0, grade_url + "/R1")
+        round_names.insert(0, "R1")
+
+    print(f"Rounds detected: {round_names}")
+
+    round_log = []   # (round_url, games, fetched_scores, box_scores_complete, all_scored)
+    past_results = False
+    for r_name, r_url in zip(round_names, round_urls):
+        cached = None if full_refresh else state.get(grade_name, r_url)
+
+        # -----------------------
+        # Finalized in an earlier run: reuse fixtures and player rows, load nothing
+        # -----------------------
+        if cached and cached["final"] and all(
+            g['box_score_link'] in previous_players for g in cached["games"] if has_result(g)
+        ):
+            all_games.extend(cached["games"])
+            for g in cached["games"]:
+                all_players.extend(previous_players.rows(g['box_score_link']))
+            all_players.maybe_flush()
+            continue
+
+        # -----------------------
+        # Rounds after the first fully future one are not visited
+        # -----------------------
+        if past_results:
+            if cached:
+                all_games.extend(cached["games"])
+                for g in cached["games"]:
+                    all_players.extend(previous_players.rows(g['box_score_link']))
+                all_players.maybe_flush()
+            continue
+
+        round_games = scrape_round(loader, grade_name, r_name, r_url)
+        loaded = round_games is not None
+        if not loaded:
+            round_games = cached["games"] if cached else []  # listing failed to load; keep what we knew
+        all_games.extend(round_games)
+
+        # -----------------------
+        # Player stats for new games or games whose score changed
+        # -----------------------
+        fetched_scores = dict(cached["fetched_scores"]) if cached else {}
+        complete = True
+        for game in round_games:
+            if not has_result(game):
+                continue
+            link = game['box_score_link']
+            game_players = None if full_refresh else previous_players.rows(link)
+            if full_refresh or state.needs_box_score(grade_name, r_url, game, bool(game_players)):
+                game_players = scrape_box_score(loader, game)
+                if game_players:
+                    fetched_scores[link] = [game['home_score'], game['away_score']]
+            if game_players:
+                all_players.extend(game_players)
+                all_players.maybe_flush()
+            else:
+                complete = False
+
+        any_scored = any(has_result(g) for g in round_games)
+        all_scored = bool(round_games) and all(has_result(g) for g in round_games)
+        round_log.append((r_url, round_games, fetched_scores, complete and any_scored, all_scored))
+        # only a listing that loaded and is dated entirely in the future ends the grade;
+        # failed loads and empty (bye / washout) rounds never do
+        if loaded and not any_scored and not FETCH_FUTURE_FIXTURES and is_future_round(round_games):
+            print(f"{grade_name} - {r_name} has not been played yet; skipping later rounds")
+            past_results = True
+
+    # A round is final once all its box scores are in and either every game has a
+    # score or a later round already has results (so missing scores are true forfeits).
+    for i, (r_url, round_games, fetched_scores, complete, all_scored) in enumerate(round_log):
+        later_results = any(has_result(g) for entry in round_log[i + 1:] for g in entry[1])
+        state.put(grade_name, r_url, round_games, fetched_scores, final=complete and (all_scored or later_results))
+    state.save()
+
+    loader.quit()
+
+# -----------------------
+# Follow-up run: retry only the pages in the failure ledger
+# -----------------------
+def retry_failed_pages():
+    if os.path.exists(GAMES_CSV):
+        all_games.extend_frame(pd.read_csv(GAMES_CSV, dtype=STRING_DTYPES))
+    if os.path.exists(PLAYERS_CSV):
+        all_players.extend_frame(pd.read_csv(PLAYERS_CSV, dtype=STRING_DTYPES))
+
+    print(f"Retrying {len(ledger)} failed pages from {ledger.path}")
+    loader = PageLoader(create_driver, ledger)
+    pending_games = []
+    for url, entry in ledger.pending("fixtures"):
+        ctx = entry["context"]
+        for game in scrape_round(loader, ctx["grade"], ctx["round"], url) or []:
+            if game['box_score_link'] not in all_games:
+                all_games.append(game)
+                if not game['forfeit']:
+                    pending_games.append(game)
+
+    pending_games.extend(entry["context"] for _, entry in ledger.pending("box_score"))
+    for game in pending_games:
+        all_players.extend(scrape_box_score(loader, game))
+        all_players.maybe_flush()
+
+    for url, _ in ledger.pending("grade"):
+        print(f"Grade page still failing, needs a full scrape: {url}")
+    loader.quit()
+
+# -----------------------
+# Entry point
+# -----------------------
+def run(start_page=START_PAGE, retry_failed=False, full_refresh=False, future_fixtures=None):
+    """Scrape every grade under start_page into GAMES_CSV / PLAYERS_CSV.
+
+    retry_failed only re-scrapes the pages left in the failure ledger;
+    full_refresh ignores the saved round state and re-renders every page;
+    future_fixtures overrides FETCH_FUTURE_FIXTURES.
+    """
+    global ledger, state, pool, all_games, all_players, previous_players, FETCH_FUTURE_FIXTURES
+    if future_fixtures is not None:
+        FETCH_FUTURE_FIXTURES = future_fixtures
+    ledger = FailureLedger()
+    state = RoundState()
+    pool = StringPool()
+    all_games = RowBuffer(GAME_COLUMNS, key="box_score_link", path=GAMES_CSV, pool=pool)
+    all_players = RowBuffer(PLAYER_COLUMNS, key="box_score_link", path=PLAYERS_CSV, pool=pool)
+    previous_players = RowBuffer(PLAYER_COLUMNS, key="box_score_link", pool=pool)
+
+    if retry_failed:
+        retry_failed_pages()
+    else:
+        if not full_refresh:
+            load_previous_players()
+
+        # -----------------------
+        # Launch threads per grade
+        # -----------------------
+        threads = []
+        for grade_name, grade_url in collect_grades(start_page):
+            t = threading.Thread(target=scrape_grade, args=(grade_name, grade_url, full_refresh))
+            t.start()
+            threads.append(t)
+
+        for t in threads:
+            t.join()
+
+    # -----------------------
+    # Save CSVs
+    # -----------------------
+    n_games = all_games.close()
+    n_players = all_players.close()
+
+    print(f"\nScraping complete! {n_games} games and {n_players} player records saved "
+          f"({all_players.chunks} chunks, {len(pool)} distinct strings).")
+    if len(ledger):
+        print(f"{len(ledger)} pages still failing; run `python -m elo_tracker scrape --retry-failed` to fill the gaps.")
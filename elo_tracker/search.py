@@ -0,0 +1,377 @@
+import bisect
+import csv
+import heapq
+import math
+import mmap
+import os
+import re
+import unicodedata
+from array import array
+from datetime import date
+from itertools import chain
+
+# -----------------------
+# Configuration
+# -----------------------
+INDEX_DIR = "data/search"
+MIN_SIMILARITY = 0.35     # trigram Jaccard needed for a fuzzy match
+MAX_RESULTS = 10
+FUZZY_SEED = 2_000        # docs of the rarest query grams scored up front to set the top-k bar
+CHUNKSIZE = 200_000       # box score rows read at a time for last-played dates
+KINDS = ("player", "team")
+
+PLAYER_ELO_CSV = "data/player_elo.csv"
+TEAM_ELO_CSV = "data/team_elo.csv"
+PLAYERS_CSV = "data/player_stats.csv"
+
+
+# -----------------------
+# Normalisation
+# -----------------------
+def normalise(text):
+    """Lower-case ASCII words: accents folded, punctuation dropped, whitespace collapsed."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def trigrams(norm):
+    """Distinct trigrams of each word, padded so word starts and ends carry weight."""
+    grams = set()
+    for word in norm.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# -----------------------
+# Building (run after the rating stage)
+# -----------------------
+def _last_played(players_csv, chunksize=CHUNKSIZE):
+    """player_name -> ISO date of their most recent box score, if the stats file is there.
+
+    The stats file is read in chunks, so memory is bounded by chunksize plus
+    one date per player, as in `rate --stream`.
+    """
+    if not os.path.exists(players_csv):
+        return {}
+    import pandas as pd
+    last = {}
+    for chunk in pd.read_csv(players_csv, usecols=["player_name", "game_date"], chunksize=chunksize):
+        dates = pd.to_datetime(chunk["game_date"], errors="coerce")
+        for name, d in dates.groupby(chunk["player_name"]).max().dropna().items():
+            if name not in last or d > last[name]:
+                last[name] = d
+    return {name: d.date().isoformat() for name, d in last.items()}
+
+
+def _read_rows(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _vocabulary(pairs):
+    """Sorted distinct keys, [start, end) offsets per key, and the doc ids (ascending within each key)."""
+    pairs.sort()
+    vocab, offsets = [], array("I")
+    for i, (key, _) in enumerate(pairs):
+        if not vocab or vocab[-1] != key:
+            vocab.append(key)
+            offsets.append(i)
+    offsets.append(len(pairs))
+    return vocab, offsets, array("I", (doc_id for _, doc_id in pairs))
+
+
+def _write(out_dir, name, values):
+    with open(os.path.join(out_dir, name), "wb") as f:
+        if isinstance(values, array):
+            values.tofile(f)
+        else:
+            f.write(values)
+
+
+def _write_strings(out_dir, name, strings):
+    """A UTF-8 blob (name.bin) plus uint32 [start, end) offsets per string (name_offsets.bin)."""
+    blob, offsets = bytearray(), array("I", [0])
+    for text in strings:
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+    _write(out_dir, f"{name}.bin", bytes(blob))
+    _write(out_dir, f"{name}_offsets.bin", offsets)
+
+
+def build_index(out_dir=INDEX_DIR, player_csv=PLAYER_ELO_CSV, team_csv=TEAM_ELO_CSV, players_csv=PLAYERS_CSV,
+                chunksize=CHUNKSIZE):
+    """Write the trigram / prefix index over player and team names; returns the doc count.
+
+    Docs are numbered in descending rating order, so every posting list is
+    already in rank order and results need no re-sort for the default ranking.
+    Everything is a flat binary array or a string blob plus offsets, which
+    SearchIndex memory-maps, so opening the index parses nothing.
+    """
+    last_played = _last_played(players_csv, chunksize)
+    docs = []
+    for row in _read_rows(player_csv):
+        docs.append(("player", row["player_name"], row.get("team_name") or row.get("team_id") or "",
+                     float(row["ELO"]), last_played.get(row["player_name"], "")))
+    for row in _read_rows(team_csv):
+        docs.append(("team", row["team_name"], row["team_id"], float(row["ELO"]), ""))
+    docs.sort(key=lambda d: -d[3])
+
+    postings = {}
+    words, norms, gram_counts = [], [], array("B")
+    for doc_id, doc in enumerate(docs):
+        norm = normalise(doc[1])
+        norms.append(norm)
+        grams = trigrams(norm)
+        gram_counts.append(min(len(grams), 255))
+        for gram in grams:
+            postings.setdefault(gram, array("I")).append(doc_id)
+        words.extend((word, doc_id) for word in set(norm.split()))
+
+    os.makedirs(out_dir, exist_ok=True)
+    # per-doc columns; name, team and normalised name are one NUL-joined string per doc
+    _write(out_dir, "doc_kind.bin", bytes(KINDS.index(d[0]) for d in docs))
+    _write(out_dir, "doc_rating.bin", array("d", (d[3] for d in docs)))
+    _write(out_dir, "doc_last.bin", array("I", (date.fromisoformat(d[4]).toordinal() if d[4] else 0 for d in docs)))
+    _write(out_dir, "doc_grams.bin", gram_counts)
+    _write_strings(out_dir, "docs", ("\0".join((d[1], d[2], norm)) for d, norm in zip(docs, norms)))
+    # doc ids ordered by normalised name (ties in rating order), for exact and whole-name prefix lookups
+    _write(out_dir, "by_name.bin", array("I", sorted(range(len(docs)), key=lambda i: (norms[i], i))))
+
+    # Posting lists are concatenated into one uint32 blob, [start, end) per gram in gram order
+    blob, offsets = array("I"), array("I", [0])
+    for gram in sorted(postings):
+        blob.extend(postings[gram])
+        offsets.append(len(blob))
+    _write(out_dir, "postings.bin", blob)
+    _write(out_dir, "posting_offsets.bin", offsets)
+    _write_strings(out_dir, "grams", sorted(postings))
+
+    vocab, offsets, ids = _vocabulary(words)
+    _write(out_dir, "words.bin", ids)
+    _write(out_dir, "word_offsets.bin", offsets)
+    _write_strings(out_dir, "word_keys", vocab)
+    return len(docs)
+
+
+# -----------------------
+# Querying (standard library only)
+# -----------------------
+def _map(path, typecode="B"):
+    """Read-only memoryview of a whole file, memory-mapped (pages load on first touch)."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+    return memoryview(buf).cast(typecode)
+
+
+class _Strings:
+    """Sequence view over a string blob: item i is the bytes of string i (bisect-able when sorted)."""
+
+    def __init__(self, path, name):
+        self.blob = _map(os.path.join(path, f"{name}.bin"))
+        self.offsets = _map(os.path.join(path, f"{name}_offsets.bin"), "I")
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+class _ByName:
+    """Normalised names in by_name order, as bytes (so bisect can search it)."""
+
+    def __init__(self, docs, order):
+        self.docs = docs
+        self.order = order
+
+    def __getitem__(self, i):
+        return self.docs[self.order[i]].rsplit(b"\0", 1)[1]
+
+    def __len__(self):
+        return len(self.order)
+
+
+def _contains(posting, doc_id):
+    i = bisect.bisect_left(posting, doc_id)
+    return i < len(posting) and posting[i] == doc_id
+
+
+def _unique(sorted_ids):
+    last = None
+    for doc_id in sorted_ids:
+        if doc_id != last:
+            last = doc_id
+            yield doc_id
+
+
+class SearchIndex:
+    """Persisted name index. search() returns exact, then prefix, then fuzzy matches."""
+
+    def __init__(self, path=INDEX_DIR):
+        self.kinds = _map(os.path.join(path, "doc_kind.bin"))
+        self.ratings = _map(os.path.join(path, "doc_rating.bin"), "d")
+        self.last_played = _map(os.path.join(path, "doc_last.bin"), "I")
+        self.gram_counts = _map(os.path.join(path, "doc_grams.bin"))
+        self.docs = _Strings(path, "docs")
+        self.by_name = _ByName(self.docs, _map(os.path.join(path, "by_name.bin"), "I"))
+        self.grams = _Strings(path, "grams")
+        self.postings = _map(os.path.join(path, "postings.bin"), "I")
+        self.posting_offsets = _map(os.path.join(path, "posting_offsets.bin"), "I")
+        self.words = _Strings(path, "word_keys")
+        self.word_ids = _map(os.path.join(path, "words.bin"), "I")
+        self.word_offsets = _map(os.path.join(path, "word_offsets.bin"), "I")
+
+    def _posting(self, gram):
+        key = gram.encode("utf-8")
+        k = bisect.bisect_left(self.grams, key)
+        if k < len(self.grams) and self.grams[k] == key:
+            return self.postings[self.posting_offsets[k]:self.posting_offsets[k + 1]]
+        return self.postings[0:0]
+
+    def _word_prefix(self, prefix):
+        """Doc ids with any word starting with prefix, merged lazily in rating order."""
+        lo = bisect.bisect_left(self.words, prefix.encode("utf-8"))
+        hi = bisect.bisect_left(self.words, (prefix + "\x7f").encode("utf-8"))
+        return _unique(heapq.merge(*(self.word_ids[self.word_offsets[k]:self.word_offsets[k + 1]]
+                                     for k in range(lo, hi))))
+
+    def _name_range(self, lo_key, hi_key):
+        """Doc ids whose normalised name is in [lo_key, hi_key), in rating order."""
+        lo = bisect.bisect_left(self.by_name, lo_key.encode("utf-8"))
+        hi = bisect.bisect_left(self.by_name, hi_key.encode("utf-8"), lo)
+        return sorted(self.by_name.order[lo:hi])
+
+    @staticmethod
+    def _counted(sorted_ids):
+        """(doc_id, occurrences) for a sorted id stream."""
+        last, count = None, 0
+        for doc_id in chain(sorted_ids, (None,)):
+            if doc_id == last:
+                count += 1
+                continue
+            if last is not None:
+                yield last, count
+            last, count = doc_id, 1
+
+    def _matches(self, norm, seen):
+        """(doc_id, tier, similarity) of the exact, then prefix tier, each in rating order.
+
+        Doc ids are in rating order, so each tier is just its sorted ids and the
+        caller can stop as soon as it has enough results. Every doc yielded is
+        added to seen.
+        """
+        for doc_id in self._name_range(norm, norm + "\0"):
+            seen.add(doc_id)
+            yield doc_id, 0, 1.0
+        # A single word matches any word of a name; longer queries match the start of the whole name
+        prefixed = self._word_prefix(norm) if " " not in norm else self._name_range(norm, norm + "\x7f")
+        for doc_id in prefixed:
+            if doc_id not in seen:
+                seen.add(doc_id)
+                yield doc_id, 1, 1.0
+
+    def _fuzzy(self, norm, seen, min_similarity, keep=None, kind_code=None):
+        """Fuzzy tier as (doc_id, 2, similarity), most similar first, rating order within ties.
+
+        A doc at similarity t shares at least ceil(t * len(query)) of the query's
+        grams, so candidates only come from the rarest len - need + 1 grams; the
+        other grams are checked by binary search, and the doc's own gram count
+        completes the Jaccard. With keep, only the best keep matches are kept:
+        docs of the rarest grams are scored first, the k-th best similarity
+        becomes the bar, and as it rises the merge is restarted (from the
+        current doc id) over fewer, rarer grams.
+        """
+        query = trigrams(norm)
+        lists = sorted((self._posting(g) for g in query), key=len)
+        best_k = []   # min-heap of (similarity, -doc_id): the worst kept match on top
+        bar = min_similarity
+
+        def offer(doc_id, similarity):
+            if keep is None or len(best_k) < keep:
+                heapq.heappush(best_k, (similarity, -doc_id))
+            elif (similarity, -doc_id) > best_k[0]:
+                heapq.heapreplace(best_k, (similarity, -doc_id))
+
+        # Seed the bar from the docs of the rarest grams (likely the intended name), scored exactly
+        seeded = set()
+        if keep is not None:
+            for posting in lists:
+                if len(seeded) + len(posting) > FUZZY_SEED:
+                    break
+                seeded.update(posting)
+            for doc_id in seeded:
+                if doc_id in seen or (kind_code is not None and self.kinds[doc_id] != kind_code):
+                    continue
+                shared = sum(_contains(posting, doc_id) for posting in lists)
+                similarity = shared / (len(query) + self.gram_counts[doc_id] - shared)
+                if similarity >= min_similarity:
+                    offer(doc_id, similarity)
+            if len(best_k) == keep:
+                bar = max(bar, best_k[0][0])
+
+        start = 0
+        while True:
+            n_rare = len(query) - max(1, math.ceil(bar * len(query) - 1e-9)) + 1
+            rare, common = lists[:n_rare], lists[n_rare:]
+            merged = heapq.merge(*(p[bisect.bisect_left(p, start):] for p in rare))
+            for doc_id, shared in self._counted(merged):
+                if doc_id in seen or doc_id in seeded or (kind_code is not None and self.kinds[doc_id] != kind_code):
+                    continue
+                size = self.gram_counts[doc_id]
+                best = min(shared + len(common), size)
+                if best < bar * (len(query) + size - best):
+                    continue   # can't reach the bar even if every common gram matched
+                for posting in common:
+                    if _contains(posting, doc_id):
+                        shared += 1
+                similarity = shared / (len(query) + size - shared)
+                if similarity < bar:
+                    continue
+                offer(doc_id, similarity)
+                if keep is not None and len(best_k) == keep and best_k[0][0] > bar:
+                    bar = best_k[0][0]
+                    if math.ceil(bar * len(query) - 1e-9) > len(query) - n_rare + 1:
+                        start = doc_id + 1
+                        break   # fewer grams can now supply every candidate
+            else:
+                break
+        return [(-neg_id, 2, similarity) for similarity, neg_id in sorted(best_k, reverse=True)]
+
+    def search(self, text, kind=None, limit=MAX_RESULTS, by="rating", fuzzy=True, min_similarity=MIN_SIMILARITY):
+        """Matches for text as dicts: exact, then prefix, each by rating (or most recent game),
+        then fuzzy matches by similarity, ties broken the same way."""
+        norm = normalise(text)
+        if not norm:
+            return []
+
+        kind_code = KINDS.index(kind) if kind else None
+        hits, seen = [], set()
+        for hit in self._matches(norm, seen):
+            if len(hits) >= limit and hit[1] > hits[-1][1]:
+                break   # earlier tiers already fill the results, whatever the ordering
+            if kind_code is not None and self.kinds[hit[0]] != kind_code:
+                continue
+            hits.append(hit)
+            if by == "rating" and len(hits) >= limit:
+                break   # matches arrive in rank order
+        if fuzzy and len(norm) >= 3 and len(hits) < limit:
+            keep = limit - len(hits) if by == "rating" else None
+            hits.extend(self._fuzzy(norm, seen, min_similarity, keep, kind_code))
+        if by == "recency":
+            # stable sort: tier, similarity, then most recent game; rating order breaks ties
+            hits.sort(key=lambda h: (h[1], -h[2], -self.last_played[h[0]]))
+
+        results = []
+        for doc_id, tier, similarity in hits[:limit]:
+            name, team, _ = (field.decode("utf-8") for field in self.docs[doc_id].split(b"\0"))
+            last = self.last_played[doc_id]
+            results.append({
+                "kind": KINDS[self.kinds[doc_id]], "name": name, "team": team, "rating": self.ratings[doc_id],
+                "last_played": date.fromordinal(last).isoformat() if last else None,
+                "match": ("exact", "prefix", "fuzzy")[tier], "similarity": round(similarity, 3),
+            })
+        return results
@@ -0,0 +1,228 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .predict import BASE_ELO, HOME_ADVANTAGE, GAMES_CSV, ID_COLS, load_ratings, past_forfeits, win_probability
+
+# ---------------------------
+# Config
+# ---------------------------
+N_SIMS = 100_000
+BATCH_SIZE = 25_000           # sims per task; fixed so results don't depend on the worker count
+SEED = 2025
+FINALS_TEAMS = 4              # 1v4 / 2v3 semi finals, winners meet in the grand final
+# "Semi Final", "Grand Final", "SF", "PF2", ... are not ladder rounds
+FINALS_ROUND = re.compile(r"final|\b[SGPQE]F\d*\b", re.IGNORECASE)
+GRAND_FINAL = re.compile(r"grand|\bGF\d*\b", re.IGNORECASE)
+SIMULATION_CSV = "data/simulation.csv"
+
+
+# ---------------------------
+# Per-grade inputs (plain arrays so they pickle cheaply to workers)
+# ---------------------------
+def grade_inputs(df_grade, team_elo, home_advantage=HOME_ADVANTAGE):
+    """Current ladder and remaining fixtures of one grade, as team-indexed arrays."""
+    teams = pd.unique(pd.concat([df_grade["home_team_id"], df_grade["away_team_id"]]))
+    team_idx = {t: i for i, t in enumerate(teams)}
+    n = len(teams)
+
+    names = {}
+    for side in ("home", "away"):
+        if f"{side}_team" in df_grade.columns:
+            names.update(zip(df_grade[f"{side}_team_id"], df_grade[f"{side}_team"]))
+
+    unplayed = df_grade["home_score"].isna() | df_grade["away_score"].isna()
+    forfeit = df_grade["forfeit"].astype(bool) if "forfeit" in df_grade.columns else unplayed & False
+    unplayed |= forfeit
+    finals = df_grade["round"].astype(str).str.contains(FINALS_ROUND)
+    played = df_grade[~unplayed & ~finals]
+
+    remaining = df_grade[unplayed & ~finals & ~past_forfeits(df_grade)]
+
+    # Wins are counted in halves so draws stay integral
+    half_wins = np.zeros(n, dtype=np.int64)
+    points_for = np.zeros(n)
+    points_against = np.zeros(n)
+    home = played["home_team_id"].map(team_idx).to_numpy(dtype=np.int64)
+    away = played["away_team_id"].map(team_idx).to_numpy(dtype=np.int64)
+    hs = played["home_score"].to_numpy(dtype=float)
+    as_ = played["away_score"].to_numpy(dtype=float)
+    np.add.at(half_wins, home, np.where(hs > as_, 2, np.where(hs == as_, 1, 0)))
+    np.add.at(half_wins, away, np.where(as_ > hs, 2, np.where(hs == as_, 1, 0)))
+    np.add.at(points_for, home, hs)
+    np.add.at(points_for, away, as_)
+    np.add.at(points_against, home, as_)
+    np.add.at(points_against, away, hs)
+
+    # Scores aren't simulated, so ties on wins fall back to the current percentage
+    percentage = np.divide(points_for, points_against, out=np.zeros(n), where=points_against > 0)
+    tiebreak = np.empty(n)
+    tiebreak[np.argsort(percentage, kind="stable")] = np.arange(n) / n
+
+    elo = np.array([team_elo.get(t, BASE_ELO) for t in teams], dtype=float)
+    elo = np.where(np.isnan(elo), BASE_ELO, elo)
+
+    # Finals already decided: +1 won / -1 lost, per team, for the semi finals and the grand final
+    finals_played = df_grade[finals & ~unplayed]
+    is_gf = finals_played["round"].astype(str).str.contains(GRAND_FINAL).to_numpy()
+    semi_result = np.zeros(n, dtype=np.int64)
+    gf_result = np.zeros(n, dtype=np.int64)
+    for result, rows in ((semi_result, finals_played[~is_gf]), (gf_result, finals_played[is_gf])):
+        for h, a, hs, as_ in zip(rows["home_team_id"], rows["away_team_id"], rows["home_score"], rows["away_score"]):
+            if hs != as_:
+                winner, loser = (h, a) if hs > as_ else (a, h)
+                result[team_idx[winner]], result[team_idx[loser]] = 1, -1
+    # a grand finalist won its semi final even if that row is missing
+    semi_result = np.where(semi_result != 0, semi_result, np.abs(gf_result))
+
+    fix_home = remaining["home_team_id"].map(team_idx).to_numpy(dtype=np.int64)
+    fix_away = remaining["away_team_id"].map(team_idx).to_numpy(dtype=np.int64)
+    return {
+        "teams": list(teams),
+        "names": [names.get(t, t) for t in teams],
+        "elo": elo,
+        "half_wins": half_wins,
+        "percentage": percentage,
+        "tiebreak": tiebreak,
+        "fix_home": fix_home,
+        "fix_away": fix_away,
+        "fix_prob": win_probability(elo[fix_home] + home_advantage - elo[fix_away]),
+        "home_advantage": home_advantage,
+        "remaining_rounds": remaining["round"].nunique(),
+        "finals_listed": bool(finals.any()),
+        "semi_result": semi_result,
+        "gf_result": 2 * gf_result + semi_result,
+    }
+
+
+# ---------------------------
+# One batch of simulations, vectorized over the sim axis
+# ---------------------------
+def simulate_batch(inputs, n_sims, seed):
+    """Play out the remaining fixtures n_sims times; returns summed counts for this batch."""
+    rng = np.random.default_rng(seed)
+    n = len(inputs["teams"])
+    fix_home, fix_away = inputs["fix_home"], inputs["fix_away"]
+
+    # (sims, fixtures) outcomes, folded into (sims, teams) half-win totals
+    home_won = rng.random((n_sims, len(fix_home))) < inputs["fix_prob"]
+    half_wins = np.broadcast_to(inputs["half_wins"], (n_sims, n)).copy()
+    for f in range(len(fix_home)):
+        half_wins[:, fix_home[f]] += 2 * home_won[:, f]
+        half_wins[:, fix_away[f]] += 2 * ~home_won[:, f]
+
+    # Ladder: wins, then current percentage
+    order = np.argsort(-(half_wins + inputs["tiebreak"]), axis=1, kind="stable")
+    finish = np.zeros((n, n), dtype=np.int64)
+    np.add.at(finish, (order, np.broadcast_to(np.arange(n), order.shape)), 1)
+
+    made_finals = np.zeros(n, dtype=np.int64)
+    made_gf = np.zeros(n, dtype=np.int64)
+    premiers = np.zeros(n, dtype=np.int64)
+    if n >= FINALS_TEAMS:
+        elo, adv = inputs["elo"], inputs["home_advantage"]
+        seeds = order[:, :FINALS_TEAMS]
+
+        def play(high, low, known):
+            """Random by ELO, unless the finals results already in decide the game."""
+            p_high = win_probability(elo[high] + adv - elo[low])
+            p_high = np.where(known[high] > known[low], 1.0, np.where(known[high] < known[low], 0.0, p_high))
+            return np.where(rng.random(len(high)) < p_high, high, low)
+
+        semi, gf = inputs["semi_result"], inputs["gf_result"]
+        sf1 = play(seeds[:, 0], seeds[:, 3], semi)
+        sf2 = play(seeds[:, 1], seeds[:, 2], semi)
+        # The better-placed semi final winner hosts the grand final
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, np.arange(n)[None, :], axis=1)
+        rows = np.arange(n_sims)
+        sf1_first = rank[rows, sf1] < rank[rows, sf2]
+        gf_host = np.where(sf1_first, sf1, sf2)
+        gf_visitor = np.where(sf1_first, sf2, sf1)
+        champion = play(gf_host, gf_visitor, gf)
+
+        made_finals = np.bincount(seeds.ravel(), minlength=n)
+        made_gf = np.bincount(sf1, minlength=n) + np.bincount(sf2, minlength=n)
+        premiers = np.bincount(champion, minlength=n)
+
+    return {
+        "finish": finish,
+        "total_half_wins": half_wins.sum(axis=0),
+        "made_finals": made_finals,
+        "made_gf": made_gf,
+        "premiers": premiers,
+    }
+
+
+def _batch_task(args):
+    grade, inputs, n_sims, seed = args
+    return grade, simulate_batch(inputs, n_sims, seed)
+
+
+# ---------------------------
+# Whole association
+# ---------------------------
+def simulate_season(games_csv=GAMES_CSV, team_elo=None, n_sims=N_SIMS, seed=SEED, workers=None,
+                    batch_size=BATCH_SIZE, home_advantage=HOME_ADVANTAGE, team_col="ELO"):
+    """Ladder finish and finals probabilities for every team in every grade.
+
+    Each grade's sims are split into fixed-size batches seeded from one
+    SeedSequence, so a given seed gives the same table for any worker count.
+    """
+    if team_elo is None:
+        team_elo, _ = load_ratings(team_col=team_col)
+    df_games = pd.read_csv(games_csv, dtype=ID_COLS)
+
+    grades = {}
+    for grade, df_grade in df_games.groupby("grade", sort=False):
+        grades[grade] = inputs = grade_inputs(df_grade, team_elo, home_advantage)
+        # a default scrape stops after the first future round, which leaves at most one round to play
+        if inputs["remaining_rounds"] <= 1 and not inputs["finals_listed"]:
+            print(f"Warning: {grade} has {inputs['remaining_rounds']} remaining round(s) and no finals listed; "
+                  f"the fixture looks truncated, re-scrape with `scrape --future-fixtures` for full-season odds")
+
+    tasks = []
+    root = np.random.SeedSequence(seed)
+    for grade, grade_seed in zip(grades, root.spawn(len(grades))):
+        sizes = [batch_size] * (n_sims // batch_size) + ([n_sims % batch_size] if n_sims % batch_size else [])
+        for size, batch_seed in zip(sizes, grade_seed.spawn(len(sizes))):
+            tasks.append((grade, grades[grade], size, batch_seed))
+
+    if workers == 1:
+        results = list(map(_batch_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = list(pool.map(_batch_task, tasks))
+
+    totals = {}
+    for grade, counts in results:
+        if grade not in totals:
+            totals[grade] = counts
+        else:
+            for key, value in counts.items():
+                totals[grade][key] = totals[grade][key] + value
+
+    rows = []
+    for grade, inputs in grades.items():
+        counts = totals[grade]
+        for i, team_id in enumerate(inputs["teams"]):
+            row = {
+                "grade": grade,
+                "team_id": team_id,
+                "team_name": inputs["names"][i],
+                "ELO": inputs["elo"][i],
+                "wins": inputs["half_wins"][i] / 2,
+                "remaining": int(np.sum(inputs["fix_home"] == i) + np.sum(inputs["fix_away"] == i)),
+                "expected_wins": counts["total_half_wins"][i] / 2 / n_sims,
+                "p_finals": counts["made_finals"][i] / n_sims,
+                "p_grand_final": counts["made_gf"][i] / n_sims,
+                "p_premier": counts["premiers"][i] / n_sims,
+            }
+            for pos in range(len(inputs["teams"])):
+                row[f"p_finish_{pos + 1}"] = counts["finish"][i, pos] / n_sims
+            rows.append(row)
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,237 @@
+import heapq
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .compile_season import game_lines
+from .leaderboard import LeaderboardSet
+from .team_rating import RollingTeamRating
+from .rating import BASE_ELO, K_PLAYER, TEAM_TOP_N, ROLLING_WINDOW, expected_distribution
+
+# ---------------------------
+# Config (hyperparameters come from rating.py)
+# ---------------------------
+GAMES_CSV = "data/full_season.csv"
+PLAYERS_CSV = "data/player_stats.csv"
+OUT_DIR = "data"
+CHUNKSIZE = 200_000       # rows held in memory per chunk
+ID_DTYPES = {"home_team_id": str, "away_team_id": str, "team": str, "player_id": str}
+ROW_COL = "_row"          # original file row, the tie-break that keeps ordering stable
+
+
+# ---------------------------
+# External merge sort by (date, file row)
+# ---------------------------
+def _read_chunks(path, date_col, chunksize):
+    first_row = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=ID_DTYPES):
+        chunk[ROW_COL] = np.arange(first_row, first_row + len(chunk), dtype=np.int64)
+        first_row += len(chunk)
+        chunk[date_col] = pd.to_datetime(chunk[date_col])
+        yield chunk
+
+
+class _Run:
+    """One sorted run on disk, read back a block at a time."""
+
+    def __init__(self, block_paths, date_col):
+        self.block_paths = list(block_paths)
+        self.date_col = date_col
+        self.df = None
+        self._next_block()
+
+    def _next_block(self):
+        if self.block_paths:
+            self.df = pd.read_pickle(self.block_paths.pop(0))
+            self.dates = self.df[self.date_col].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+            self.rows = self.df[ROW_COL].to_numpy()
+            self.pos = 0
+        else:
+            self.df = None
+
+    def head(self):
+        return (self.dates[self.pos], self.rows[self.pos])
+
+    def take_until(self, limit):
+        """Slice off every row in the current block whose key is below limit (None = all)."""
+        if limit is None:
+            end = len(self.df)
+        else:
+            d, r = limit
+            lo = np.searchsorted(self.dates, d, side="left")
+            hi = np.searchsorted(self.dates, d, side="right")
+            end = lo + np.searchsorted(self.rows[lo:hi], r)
+        end = max(end, self.pos + 1)
+        out = self.df.iloc[self.pos:end]
+        self.pos = end
+        if self.pos >= len(self.df):
+            self._next_block()
+        return out
+
+
+def date_ordered_chunks(path, date_col, chunksize=CHUNKSIZE, tmp_dir=None):
+    """Yield DataFrames of path in (date, file row) order with memory bounded by chunksize.
+
+    Pass 1 sorts each chunk into a run of small pickled blocks and notes whether
+    the file was already in order; if it was, the runs are simply replayed,
+    otherwise they are k-way merged block by block.
+    """
+    work = tempfile.mkdtemp(prefix="elo-sort-", dir=tmp_dir)
+    try:
+        runs = []
+        in_order = True
+        last_key = None
+        for i, chunk in enumerate(_read_chunks(path, date_col, chunksize)):
+            if chunk.empty:
+                continue
+            if in_order:
+                if not chunk[date_col].is_monotonic_increasing:
+                    in_order = False
+                elif last_key is not None and chunk[date_col].iloc[0] < last_key:
+                    in_order = False
+            last_key = chunk[date_col].iloc[-1]
+
+            chunk = chunk.sort_values([date_col, ROW_COL], kind="mergesort")
+            block_rows = max(1, chunksize // 8)
+            blocks = []
+            for j, start in enumerate(range(0, len(chunk), block_rows)):
+                block_path = os.path.join(work, f"run{i}-{j}.pkl")
+                chunk.iloc[start:start + block_rows].to_pickle(block_path)
+                blocks.append(block_path)
+            runs.append(blocks)
+
+        if in_order:
+            for blocks in runs:
+                for block_path in blocks:
+                    yield pd.read_pickle(block_path)
+            return
+
+        open_runs = [_Run(blocks, date_col) for blocks in runs]
+        heap = [(run.head(), n) for n, run in enumerate(open_runs) if run.df is not None]
+        heapq.heapify(heap)
+        pending, pending_rows = [], 0
+        while heap:
+            _, n = heapq.heappop(heap)
+            run = open_runs[n]
+            piece = run.take_until(heap[0][0] if heap else None)
+            pending.append(piece)
+            pending_rows += len(piece)
+            if run.df is not None:
+                heapq.heappush(heap, (run.head(), n))
+            if pending_rows >= chunksize:
+                yield pd.concat(pending)
+                pending, pending_rows = [], 0
+        if pending:
+            yield pd.concat(pending)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def by_day(chunks, date_col):
+    """Regroup date-ordered chunks into (day, rows for that day), carrying partial days over."""
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk])
+        days = chunk[date_col].dt.normalize()
+        last_day = days.iloc[-1]
+        complete = days != last_day
+        for day, rows in chunk[complete.to_numpy()].groupby(days[complete], sort=True):
+            yield day, rows
+        carry = chunk[~complete.to_numpy()]
+    if carry is not None and not carry.empty:
+        yield carry[date_col].dt.normalize().iloc[0], carry
+
+
+# ---------------------------
+# Streaming rating run (same model and outputs as rating.py)
+# ---------------------------
+def stream_rate(games_csv=GAMES_CSV, players_csv=PLAYERS_CSV, out_dir=OUT_DIR, chunksize=CHUNKSIZE, tmp_dir=None):
+    player_elo = {}
+    team_id_to_name = {}
+    home_ids, away_ids = {}, {}        # first-seen order, as pd.concat(...).unique() gives
+    last_team = {}                     # player -> (file row, team) of their last row in the file
+    boards = LeaderboardSet()
+    rolling_teams = RollingTeamRating(window=ROLLING_WINDOW)
+
+    game_days = by_day(date_ordered_chunks(games_csv, 'date', chunksize, tmp_dir), 'date')
+    player_days = by_day(date_ordered_chunks(players_csv, 'game_date', chunksize, tmp_dir), 'game_date')
+    next_players = next(player_days, None)
+
+    for day, games in game_days:
+        # players of earlier days with no games still count towards "last team"
+        while next_players is not None and next_players[0] < day:
+            _track_last_team(next_players[1], last_team)
+            next_players = next(player_days, None)
+        if next_players is not None and next_players[0] == day:
+            day_players = next_players[1]
+            _track_last_team(day_players, last_team)
+            next_players = next(player_days, None)
+        else:
+            day_players = None
+
+        if 'forfeit' not in games.columns:
+            games = games.assign(forfeit=False)
+        for _, game in games.iterrows():
+            home_team_id, away_team_id = game['home_team_id'], game['away_team_id']
+            team_id_to_name[home_team_id] = game['home_team']
+            team_id_to_name[away_team_id] = game['away_team']
+            home_ids.setdefault(home_team_id, None)
+            away_ids.setdefault(away_team_id, None)
+
+            if game['forfeit'] or day_players is None:
+                continue
+            players_in_game = day_players[day_players['team'].isin([home_team_id, away_team_id])]
+            if players_in_game.empty:
+                continue
+
+            lines = game_lines(players_in_game, home_team_id, away_team_id,
+                               game.get('home_score', 0), game.get('away_score', 0))
+            for pname in lines['player_name']:
+                if pname not in player_elo:
+                    player_elo[pname] = BASE_ELO
+            E_dist = expected_distribution([player_elo[p] for p in lines['player_name']])
+            for idx, row in lines.reset_index(drop=True).iterrows():
+                pname = row['player_name']
+                player_elo[pname] = player_elo.get(pname, BASE_ELO) + K_PLAYER * (float(row['S']) - float(E_dist[idx]))
+                boards.update(pname, player_elo[pname], grade=game.get('grade'), team=row['team'])
+            for team_id in (home_team_id, away_team_id):
+                lineup = lines[lines['team'] == team_id]
+                rolling_teams.push(team_id, [player_elo[p] for p in lineup['player_name']], lineup['raw_perf'])
+
+    while next_players is not None:
+        _track_last_team(next_players[1], last_team)
+        next_players = next(player_days, None)
+
+    # ---------------------------
+    # Outputs, row for row what rating.py writes
+    # ---------------------------
+    player_rows = []
+    for pname, elo in player_elo.items():
+        team_id = last_team[pname][1] if pname in last_team else None
+        player_rows.append({"player_name": pname, "team_id": team_id,
+                            "team_name": team_id_to_name.get(team_id, "Unknown"), "ELO": elo})
+    df_player_elos = pd.DataFrame(player_rows)
+
+    all_team_ids = list(home_ids) + [t for t in away_ids if t not in home_ids]
+    df_team_elos = pd.DataFrame([
+        {"team_id": tid, "team_name": team_id_to_name.get(tid, tid),
+         "ELO": float(boards.team_rating(tid, k=TEAM_TOP_N, default=BASE_ELO)),
+         "rolling_ELO": rolling_teams.rating(tid, default=BASE_ELO)}
+        for tid in all_team_ids
+    ])
+
+    df_player_elos.to_csv(os.path.join(out_dir, "player_elo.csv"), index=False)
+    df_team_elos.to_csv(os.path.join(out_dir, "team_elo.csv"), index=False)
+    return df_player_elos, df_team_elos
+
+
+def _track_last_team(rows, last_team):
+    for pname, row, team in zip(rows['player_name'], rows[ROW_COL], rows['team']):
+        seen = last_team.get(pname)
+        if seen is None or row > seen[0]:
+            last_team[pname] = (row, team)
+
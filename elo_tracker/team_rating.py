@@ -0,0 +1,54 @@
+from collections import deque
+
+# ---------------------------
+# Config
+# ---------------------------
+ROLLING_WINDOW = 5        # number of most recent lineups that make up a team's rating
+
+
+# ---------------------------
+# Rolling lineup-weighted team rating
+# ---------------------------
+class RollingTeamRating:
+    """Team strength from the lineups that actually played recently.
+
+    Each game pushes one lineup per team: the players' current ratings weighted
+    by their share of the team's production (points-based raw_perf, since the
+    box scores carry no minutes). A team's rating is the mean of its last
+    `window` lineup ratings, kept as a running sum so a push costs
+    O(lineup size) no matter how long the season is.
+    """
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self._lineups = {}   # team -> deque of lineup ratings
+        self._sums = {}      # team -> sum of the deque
+
+    def push(self, team, ratings, weights=None):
+        """Record one game's lineup for team and return the updated team rating."""
+        ratings = list(ratings)
+        if not ratings:
+            return self.rating(team)
+        weights = list(weights) if weights is not None else [1.0] * len(ratings)
+        total = sum(weights)
+        if total <= 0:
+            weights = [1.0] * len(ratings)
+            total = float(len(ratings))
+        value = sum(r * w for r, w in zip(ratings, weights)) / total
+
+        lineups = self._lineups.setdefault(team, deque())
+        lineups.append(value)
+        self._sums[team] = self._sums.get(team, 0.0) + value
+        if len(lineups) > self.window:
+            self._sums[team] -= lineups.popleft()
+
+        return self._sums[team] / len(lineups)
+
+    def rating(self, team, default=None):
+        lineups = self._lineups.get(team)
+        if not lineups:
+            return default
+        return self._sums[team] / len(lineups)
+
+    def ratings(self):
+        return {team: self._sums[team] / len(lineups) for team, lineups in self._lineups.items() if lineups}
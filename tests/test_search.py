@@ -0,0 +1,42 @@
+import csv
+
+from elo_tracker.search import SearchIndex, _last_played, build_index
+
+
+def _index(tmp_path, players):
+    player_csv = tmp_path / "player_elo.csv"
+    with open(player_csv, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["player_name", "team_id", "team_name", "ELO"])
+        writer.writerows(players)
+    build_index(str(tmp_path / "search"), str(player_csv), str(tmp_path / "none.csv"), str(tmp_path / "none.csv"))
+    return SearchIndex(str(tmp_path / "search"))
+
+
+def test_one_typo_query_returns_its_target_first(tmp_path):
+    # near-identical names, all rated above the one being searched for
+    players = [(f"Player AT{t} {n}", "t1", "Tigers", 1900 - t * 10 - n) for t in range(1, 10) for n in range(1, 10)]
+    players.append(("Player AT2 3", "t2", "Lions", 1000))
+    players.remove(("Player AT2 3", "t1", "Tigers", 1900 - 20 - 3))
+    index = _index(tmp_path, players)
+
+    results = index.search("Plyer AT2 3")
+    assert results[0]["name"] == "Player AT2 3"
+    assert results[0]["match"] == "fuzzy"
+    assert [r["similarity"] for r in results] == sorted((r["similarity"] for r in results), reverse=True)
+
+
+def test_exact_and_prefix_tiers_come_before_fuzzy(tmp_path):
+    index = _index(tmp_path, [("Jon Smith", "t1", "Tigers", 1500), ("John Smith", "t1", "Tigers", 1600),
+                              ("Jonathan Smyth", "t2", "Lions", 1700)])
+    assert [(r["name"], r["match"]) for r in index.search("jon smith")] == [
+        ("Jon Smith", "exact"), ("John Smith", "fuzzy")]
+    assert [r["name"] for r in index.search("jon", fuzzy=False)] == ["Jonathan Smyth", "Jon Smith"]
+
+
+def test_last_played_is_read_in_chunks(tmp_path):
+    stats = tmp_path / "player_stats.csv"
+    stats.write_text("player_name,game_date\n"
+                     "Jon Smith,2024-05-04\nAna Lee,2024-06-01\nJon Smith,2024-07-13\n"
+                     "Ana Lee,not a date\nJon Smith,2024-06-22\nBen Ito,\n")
+    assert _last_played(str(stats), chunksize=2) == {"Jon Smith": "2024-07-13", "Ana Lee": "2024-06-01"}